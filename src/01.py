@@ -1,9 +1,17 @@
-import re
+import bisect
+import itertools
+import math
+import random
+import tempfile
 import time
 from collections import Counter
+from pathlib import Path
+from typing import Iterable, Iterator
 
 import numpy as np
 
+from line_reader import iter_lines, read_lines
+
 EXAMPLE1 = """
 3   4
 4   3
@@ -14,21 +22,92 @@ EXAMPLE1 = """
 """
 
 
-def parse_input(text: str, ignore_z: bool = True) -> tuple[list[int], list[int]]:
-    left_list = []
-    right_list = []
-    for line in text.strip().split("\n"):
-        left_id, right_id = re.split(r"\s+", line.strip())
-        left_list.append(int(left_id.strip()))
-        right_list.append(int(right_id.strip()))
-    assert len(left_list) == len(right_list), "Left and right list must have the same length."
+# Number of lines that are parsed at once when the input is given as lines
+PARSE_CHUNK_SIZE = 1_000_000
+
+# The bytes separating values, as a lookup table
+WHITESPACE_BYTES = np.zeros(256, dtype=bool)
+WHITESPACE_BYTES[list(b" \t\n\r\v\f")] = True
+
+# IDs are counted with np.bincount if the largest ID is at most this many times the
+# number of IDs (plus a constant), so that the array of counts stays reasonably small
+BINCOUNT_MAX_ID_FACTOR = 8
+BINCOUNT_MIN_MAX_ID = 2 ** 16
+
+# Lines per sorted run and values per read buffer of get_total_distance_external
+EXTERNAL_SORT_CHUNK_SIZE = 10_000_000
+EXTERNAL_MERGE_BLOCK_SIZE = 100_000
+
+# Smallest number of segments per block of LocationIndex
+MIN_INDEX_BLOCK_SIZE = 64
+
+
+def find_malformed_line(text: str) -> str | None:
+    """
+    First non-empty line of the text that doesn't consist of exactly two tokens. Rather
+    than splitting the text into lines, the line of each token is looked up from the
+    positions of the line breaks, and the lines of the tokens must then come in pairs.
+    """
+    data = np.frombuffer(text.encode(), dtype=np.uint8)
+    is_space = WHITESPACE_BYTES[data]
+    is_token_start = ~is_space
+    is_token_start[1:] &= is_space[:-1]
+    token_lines = np.searchsorted(np.flatnonzero(data == ord("\n")), np.flatnonzero(is_token_start))
+    if len(token_lines) % 2 != 0:
+        token_lines = np.append(token_lines, -1)
+    pairs = token_lines.reshape(-1, 2)
+    is_malformed = pairs[:, 0] != pairs[:, 1]
+    is_malformed[1:] |= pairs[1:, 0] == pairs[:-1, 1]
+    malformed_pairs = np.flatnonzero(is_malformed)
+    if len(malformed_pairs) == 0:
+        return None
+
+    return text.split("\n")[pairs[malformed_pairs[0], 0]]
+
+
+def parse_ids(text: str) -> np.ndarray:
+    """
+    Parse lines of a left and a right ID into an int64 array of (left ID, right ID) rows.
+    NumPy parses all values at once, treating line breaks like any other whitespace, so
+    the lines are checked separately, lest the values of ragged lines are mispaired.
+    """
+    if not text or text.isspace():
+        return np.empty((0, 2), dtype=np.int64)
+    malformed_line = find_malformed_line(text)
+    if malformed_line is not None:
+        raise ValueError(f"Lines must consist of a left and a right ID, got {malformed_line!r}.")
+    # Raises a ValueError for values that aren't integers
+    ids = np.fromstring(text, dtype=np.int64, sep=" ")
+
+    return ids.reshape(-1, 2)
+
+
+def iter_id_chunks(text: str | Iterable[str], chunk_size: int = PARSE_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Parse the input into int64 arrays of (left ID, right ID) rows, each holding at most
+    chunk_size lines of a streamed input. A text is parsed at once.
+    """
+    if isinstance(text, str):
+        yield parse_ids(text)
+    else:
+        lines = iter_lines(text)
+        for chunk in iter(lambda: list(itertools.islice(lines, chunk_size)), []):
+            yield parse_ids("\n".join(chunk))
+
+
+def parse_input(text: str | Iterable[str], ignore_z: bool = True) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Both columns are parsed into int64 arrays by NumPy directly (all whitespace separates
+    values). A streamed input is parsed in chunks of PARSE_CHUNK_SIZE lines.
+    """
+    ids = np.concatenate([*iter_id_chunks(text), np.empty((0, 2), dtype=np.int64)])
 
-    return left_list, right_list
+    return ids[:, 0].copy(), ids[:, 1].copy()
 
 
-def get_distances(left_list: list[int], right_list: list[int]) -> np.array:
-    left_ids = np.sort(np.array(left_list, dtype=int))
-    right_ids = np.sort(np.array(right_list, dtype=int))
+def get_distances(left_list: np.ndarray, right_list: np.ndarray) -> np.array:
+    left_ids = np.sort(np.asarray(left_list, dtype=np.int64))
+    right_ids = np.sort(np.asarray(right_list, dtype=np.int64))
 
     return np.abs(left_ids - right_ids)
 
@@ -37,20 +116,357 @@ def get_total_distance(distances: np.array) -> int:
     return distances.sum()
 
 
-def get_similarity_score(left_list: list[int], right_list: list[int]) -> int:
-    score = 0
-    right_frequencies = Counter(right_list)
-    for left_id in left_list:
-        score += left_id * right_frequencies.get(left_id, 0)
+def write_sorted_runs(chunks: Iterable[np.ndarray], paths: tuple[Path, Path]) -> list[tuple[int, int]]:
+    """
+    Sort both columns of each chunk and append them to one file per column. Returns the
+    (offset, length) of each run, which are the same in both files.
+    """
+    runs = []
+    offset = 0
+    with open(paths[0], "wb") as left_fh, open(paths[1], "wb") as right_fh:
+        for ids in chunks:
+            np.sort(ids[:, 0]).tofile(left_fh)
+            np.sort(ids[:, 1]).tofile(right_fh)
+            runs.append((offset, len(ids)))
+            offset += len(ids)
 
-    return score
+    return runs
 
 
-if __name__ == "__main__":
-    with open("../inputs/01.txt", "r") as fh:
-        in_text = fh.read()
+def merge_sorted_runs(values: np.ndarray, runs: list[tuple[int, int]], block_size: int) -> Iterator[np.ndarray]:
+    """
+    k-way merge of the sorted runs of a (memory-mapped) array, yielding the merged
+    values in sorted blocks. Each run is read block_size values at a time. In each
+    round, all buffered values up to the smallest last value among the buffers of runs
+    that aren't used up yet are emitted, since no value that is still to be read can be
+    smaller. That takes at least one whole buffer per round, so at most k * block_size
+    values are in memory at once.
+    """
+    positions = [offset for offset, _ in runs]
+    ends = [offset + length for offset, length in runs]
+    buffers = [np.array(values[position:min(position + block_size, end)]) for position, end in zip(positions, ends)]
+    while any(len(buffer) > 0 for buffer in buffers):
+        limits = [buffer[-1] for buffer, position, end in zip(buffers, positions, ends) if position + len(buffer) < end]
+        taken = []
+        for i, buffer in enumerate(buffers):
+            num_taken = len(buffer) if not limits else int(np.searchsorted(buffer, min(limits), side="right"))
+            taken.append(buffer[:num_taken])
+            positions[i] += num_taken
+            if num_taken == len(buffer):
+                buffers[i] = np.array(values[positions[i]:min(positions[i] + block_size, ends[i])])
+            else:
+                buffers[i] = buffer[num_taken:]
+        yield np.sort(np.concatenate(taken))
+
+
+def get_total_distance_external(
+        text: str | Iterable[str],
+        chunk_size: int = EXTERNAL_SORT_CHUNK_SIZE,
+        block_size: int = EXTERNAL_MERGE_BLOCK_SIZE,
+        tmp_dir: str | Path | None = None,
+) -> int:
+    """
+    Out-of-core version of get_total_distance(get_distances(...)) for inputs that don't
+    fit into memory, e.g. text=read_lines(path). Each chunk of chunk_size lines is
+    sorted column-wise and written to temporary files in tmp_dir, which are then
+    memory-mapped and merged run by run. The merged left and right IDs are paired up
+    block by block, so the total distance is accumulated without materializing either
+    sorted list. Memory use is bounded by the chunk size and the number of runs times
+    the block size; each ID is written and read once.
+    """
+    with tempfile.TemporaryDirectory(dir=tmp_dir) as tmp:
+        paths = (Path(tmp) / "left.bin", Path(tmp) / "right.bin")
+        runs = write_sorted_runs(iter_id_chunks(text, chunk_size), paths)
+        if not runs or sum(length for _, length in runs) == 0:
+            return 0
+        left_ids, right_ids = (np.memmap(path, dtype=np.int64, mode="r") for path in paths)
+        left_blocks = merge_sorted_runs(left_ids, runs, block_size)
+        right_blocks = merge_sorted_runs(right_ids, runs, block_size)
+
+        total_distance = 0
+        left = right = np.empty(0, dtype=np.int64)
+        while True:
+            if len(left) == 0:
+                left = next(left_blocks, None)
+            if len(right) == 0:
+                right = next(right_blocks, None)
+            if left is None or right is None:
+                break
+            n = min(len(left), len(right))
+            total_distance += int(np.abs(left[:n] - right[:n]).sum())
+            left, right = left[n:], right[n:]
+        # Release the memory maps before the files are deleted
+        del left_ids, right_ids, left_blocks, right_blocks
+
+    return total_distance
+
+
+def get_similarity_score(left_list: np.ndarray, right_list: np.ndarray) -> int:
+    left_ids = np.asarray(left_list, dtype=np.int64)
+    right_ids = np.asarray(right_list, dtype=np.int64)
+    if len(left_ids) == 0 or len(right_ids) == 0:
+        return 0
+
+    max_id = right_ids.max()
+    if right_ids.min() >= 0 and max_id <= BINCOUNT_MAX_ID_FACTOR * len(right_ids) + BINCOUNT_MIN_MAX_ID:
+        # Bounded IDs: look up the frequency of each left ID directly
+        right_frequencies = np.bincount(right_ids)
+        in_range = (left_ids >= 0) & (left_ids <= max_id)
+        matched_ids = left_ids[in_range]
+        frequencies = right_frequencies[matched_ids]
+    else:
+        # Find each left ID in the sorted unique right IDs. Searching sorted keys is much
+        # more cache-friendly, and the order of the left IDs doesn't matter for the score
+        unique_right_ids, right_frequencies = np.unique(right_ids, return_counts=True)
+        left_ids = np.sort(left_ids)
+        indices = np.searchsorted(unique_right_ids, left_ids).clip(max=len(unique_right_ids) - 1)
+        found = unique_right_ids[indices] == left_ids
+        matched_ids = left_ids[found]
+        frequencies = right_frequencies[indices[found]]
+
+    if len(matched_ids) == 0:
+        return 0
+    if int(np.abs(matched_ids).max()) * int(frequencies.max()) * len(matched_ids) >= 2 ** 63:
+        # The score might overflow int64, so compute it with Python ints instead
+        return int((matched_ids.astype(object) * frequencies).sum())
+
+    return int((matched_ids * frequencies).sum())
+
+
+class LocationIndex:
+    """
+    Both location lists under inserts and removals, with the total distance and the
+    similarity score kept up to date. The similarity score changes by x * (count of x in
+    the other list) when an x is inserted or removed, so frequency maps suffice for it.
+
+    The total distance of two sorted lists of equal length is the integral over t of
+    |D(t)|, where D(t) is the number of left IDs <= t minus the number of right IDs <= t
+    (each unit of D counts one pair that hasn't been closed yet). D is a step function
+    with a step at each distinct ID, and an update adds +1 or -1 to it from the updated ID
+    onwards. The steps are kept in blocks of about sqrt(n) segments. A block that is
+    entirely affected only shifts its lazy offset, and the change of its integral
+    follows from the length of its segments with D < 0 (or D < 1) under the offset,
+    which a sorted list of its D values with cumulative lengths answers by bisection.
+    Only the block containing the updated ID is rebuilt, so an update costs
+    O(sqrt(n) * log(n)) instead of a re-sort. Segments of IDs that were removed again
+    are kept, so the blocks grow with the number of distinct IDs ever inserted.
+    """
+
+    def __init__(self, left_ids: Iterable[int] = (), right_ids: Iterable[int] = (), block_size: int | None = None):
+        left_ids = np.asarray(list(left_ids), dtype=np.int64)
+        right_ids = np.asarray(list(right_ids), dtype=np.int64)
+        self.left_counts = Counter(left_ids.tolist())
+        self.right_counts = Counter(right_ids.tolist())
+        self.num_left = len(left_ids)
+        self.num_right = len(right_ids)
+        self.similarity_score = sum(x * count * self.right_counts[x] for x, count in self.left_counts.items())
+
+        starts = np.union1d(left_ids, right_ids)
+        steps = (
+            np.searchsorted(np.sort(left_ids), starts, side="right")
+            - np.searchsorted(np.sort(right_ids), starts, side="right")
+        )
+        # The segment of the largest ID extends to infinity, where D is the difference of
+        # the list lengths, so only the part up to the largest ID is integrated
+        lengths = np.append(np.diff(starts), 0)
+        self.block_size = block_size or max(MIN_INDEX_BLOCK_SIZE, math.isqrt(len(starts)))
+        self.blocks = [
+            IndexBlock(starts[i:i + self.block_size].tolist(), steps[i:i + self.block_size].tolist(),
+                       lengths[i:i + self.block_size].tolist())
+            for i in range(0, len(starts), self.block_size)
+        ]
+        self._area = sum(block.get_area() for block in self.blocks)
 
-    lists = parse_input(in_text)
+    @property
+    def total_distance(self) -> int:
+        if self.num_left != self.num_right:
+            raise ValueError("Left and right list must have the same length.")
+        return self._area
+
+    def insert_left(self, location_id: int):
+        self.similarity_score += location_id * self.right_counts[location_id]
+        self.left_counts[location_id] += 1
+        self.num_left += 1
+        self._add_step(location_id, 1)
+
+    def insert_right(self, location_id: int):
+        self.similarity_score += location_id * self.left_counts[location_id]
+        self.right_counts[location_id] += 1
+        self.num_right += 1
+        self._add_step(location_id, -1)
+
+    def remove_left(self, location_id: int):
+        if not self.left_counts[location_id]:
+            raise KeyError(f"{location_id} is not in the left list.")
+        self.left_counts[location_id] -= 1
+        self.num_left -= 1
+        self.similarity_score -= location_id * self.right_counts[location_id]
+        self._add_step(location_id, -1)
+
+    def remove_right(self, location_id: int):
+        if not self.right_counts[location_id]:
+            raise KeyError(f"{location_id} is not in the right list.")
+        self.right_counts[location_id] -= 1
+        self.num_right -= 1
+        self.similarity_score -= location_id * self.left_counts[location_id]
+        self._add_step(location_id, 1)
+
+    def _find_block(self, location_id: int) -> int:
+        """
+        Index of the block containing the segment that location_id falls into.
+        """
+        return max(bisect.bisect_right([block.starts[0] for block in self.blocks], location_id) - 1, 0)
+
+    def _add_segment(self, location_id: int):
+        """
+        Split the segment containing location_id so that one starts at it. Its D value
+        is the one of the segment it is split from, or 0 before the smallest ID.
+        """
+        if not self.blocks:
+            self.blocks.append(IndexBlock([location_id], [0], [0]))
+            return
+        index = self._find_block(location_id)
+        block = self.blocks[index]
+        position = bisect.bisect_right(block.starts, location_id)
+        if position > 0 and block.starts[position - 1] == location_id:
+            return
+        if position == 0:
+            # Before the smallest ID, where D is 0
+            block.insert(0, location_id, 0, block.starts[0] - location_id)
+        else:
+            next_block = self.blocks[index + 1] if index + 1 < len(self.blocks) else None
+            segment_end = block.get_segment_end(position - 1, next_block)
+            value = block.values[position - 1] + block.offset
+            if segment_end is None:
+                # Extending the integrated range beyond the largest ID
+                self._area += abs(value) * (location_id - block.starts[position - 1])
+                block.lengths[position - 1] = location_id - block.starts[position - 1]
+                block.insert(position, location_id, value, 0)
+            else:
+                block.lengths[position - 1] = location_id - block.starts[position - 1]
+                block.insert(position, location_id, value, segment_end - location_id)
+        if len(block.starts) > 2 * self.block_size:
+            self.blocks[index:index + 1] = block.split()
+
+    def _add_step(self, location_id: int, delta: int):
+        self._add_segment(location_id)
+        index = self._find_block(location_id)
+        block = self.blocks[index]
+        self._area += block.add_from(bisect.bisect_left(block.starts, location_id), delta)
+        for block in self.blocks[index + 1:]:
+            self._area += block.add(delta)
+
+
+class IndexBlock:
+    """
+    Consecutive segments of the step function of LocationIndex. The D value of segment i
+    is values[i] + offset.
+    """
+
+    def __init__(self, starts: list[int], values: list[int], lengths: list[int]):
+        self.starts = starts
+        self.values = values
+        self.lengths = lengths
+        self.offset = 0
+        self._rebuild()
+
+    def _rebuild(self):
+        if self.offset:
+            self.values = [value + self.offset for value in self.values]
+            self.offset = 0
+        length_by_value = Counter()
+        for value, length in zip(self.values, self.lengths):
+            length_by_value[value] += length
+        self._sorted_values = sorted(length_by_value)
+        self._cumulative_lengths = list(itertools.accumulate(length_by_value[v] for v in self._sorted_values))
+
+    def get_values(self) -> list[int]:
+        return [value + self.offset for value in self.values]
+
+    def get_area(self) -> int:
+        return sum(abs(value + self.offset) * length for value, length in zip(self.values, self.lengths))
+
+    def get_segment_end(self, position: int, next_block: "IndexBlock | None") -> int | None:
+        if position + 1 < len(self.starts):
+            return self.starts[position + 1]
+        return next_block.starts[0] if next_block is not None else None
+
+    def insert(self, position: int, start: int, value: int, length: int):
+        self.starts.insert(position, start)
+        self.values.insert(position, value - self.offset)
+        self.lengths.insert(position, length)
+        self._rebuild()
+
+    def split(self) -> list["IndexBlock"]:
+        middle = len(self.starts) // 2
+        values = self.get_values()
+        return [
+            IndexBlock(self.starts[:middle], values[:middle], self.lengths[:middle]),
+            IndexBlock(self.starts[middle:], values[middle:], self.lengths[middle:]),
+        ]
+
+    def get_length_below(self, threshold: int) -> int:
+        """
+        Total length of the segments with a D value below threshold.
+        """
+        index = bisect.bisect_left(self._sorted_values, threshold - self.offset)
+        return self._cumulative_lengths[index - 1] if index > 0 else 0
+
+    def add(self, delta: int) -> int:
+        """
+        Add delta (+1 or -1) to all D values, returning the change of the area.
+        """
+        total_length = self._cumulative_lengths[-1] if self._cumulative_lengths else 0
+        # |D + 1| - |D| is -1 for D < 0 and 1 otherwise, |D - 1| - |D| is 1 for D < 1
+        # and -1 otherwise
+        if delta == 1:
+            change = total_length - 2 * self.get_length_below(0)
+        else:
+            change = 2 * self.get_length_below(1) - total_length
+        self.offset += delta
+
+        return change
+
+    def add_from(self, position: int, delta: int) -> int:
+        change = 0
+        for i in range(position, len(self.starts)):
+            value = self.values[i] + self.offset
+            change += (abs(value + delta) - abs(value)) * self.lengths[i]
+            self.values[i] += delta
+        self._rebuild()
+
+        return change
+
+
+def check_location_index(left_ids: Iterable[int], right_ids: Iterable[int], num_updates: int = 200, seed: int = 0):
+    """
+    Apply random pairs of inserts or removals (one to each list, so both stay equally
+    long) to a LocationIndex with tiny blocks, which are split all the time, and compare
+    its answers with recomputing them from scratch after every pair.
+    """
+    rng = random.Random(seed)
+    lists = [list(map(int, left_ids)), list(map(int, right_ids))]
+    index = LocationIndex(lists[0], lists[1], block_size=2)
+    known_ids = lists[0] + lists[1] or [0]
+    for _ in range(num_updates):
+        remove = len(lists[0]) > 0 and rng.random() < 0.4
+        for ids, insert, delete in ((lists[0], index.insert_left, index.remove_left),
+                                    (lists[1], index.insert_right, index.remove_right)):
+            if remove:
+                location_id = rng.choice(ids)
+                ids.remove(location_id)
+                delete(location_id)
+            else:
+                location_id = rng.choice(known_ids) + rng.randint(-3, 3)
+                ids.append(location_id)
+                insert(location_id)
+        left_list, right_list = (np.array(ids, dtype=np.int64) for ids in lists)
+        assert index.total_distance == get_total_distance(get_distances(left_list, right_list))
+        assert index.similarity_score == get_similarity_score(left_list, right_list)
+
+
+if __name__ == "__main__":
+    lists = parse_input(read_lines("../inputs/01.txt"))
 
     # PART 1
     start = time.perf_counter()
@@ -58,8 +474,20 @@ if __name__ == "__main__":
     end = time.perf_counter()
     print(f"Part 1 Result: {res}. Took {(end - start) * 1000:.2f} ms.")
 
+    # PART 1 (out of core, with small runs and buffers to exercise the merge)
+    assert get_total_distance_external(iter_lines(EXAMPLE1), chunk_size=2, block_size=1) == 11
+    start = time.perf_counter()
+    res_external = get_total_distance_external(read_lines("../inputs/01.txt"), chunk_size=100, block_size=7)
+    end = time.perf_counter()
+    assert res_external == res
+    print(f"Part 1 Out-of-Core Result: {res_external}. Took {(end - start) * 1000:.2f} ms.")
+
     # PART 2
     start = time.perf_counter()
     res = get_similarity_score(*lists)
     end = time.perf_counter()
     print(f"Part 2 Result: {res}. Took {(end - start) * 1000:.2f} ms.")
+
+    # INCREMENTAL UPDATES
+    check_location_index(*parse_input(EXAMPLE1))
+    check_location_index(lists[0][:100], lists[1][:100])
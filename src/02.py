@@ -1,8 +1,11 @@
-import re
+import itertools
 import time
+from typing import Iterable, Iterator
 
 import numpy as np
 
+from line_reader import iter_lines, read_lines
+
 EXAMPLE1 = """
 7 6 4 2 1
 1 2 7 8 9
@@ -12,14 +15,51 @@ EXAMPLE1 = """
 1 3 6 7 9
 """
 
+# Number of lines that are parsed at once
+PARSE_CHUNK_SIZE = 100_000
+
+
+def parse_reports(lines: list[str]) -> tuple[np.ndarray, np.ndarray]:
+    lengths = np.array([len(line.split()) for line in lines], dtype=np.int64)
+    levels = np.fromstring(" ".join(lines), dtype=np.int64, sep=" ")
+    if len(levels) != lengths.sum():
+        raise ValueError("Reports must consist of whitespace-separated integers.")
+
+    values = np.zeros((len(lines), lengths.max(initial=0)), dtype=np.int64)
+    values[get_level_mask(lengths, values.shape[1])] = levels
+
+    return values, lengths
+
 
-def parse_input(text: str) -> list[np.array]:
-    reports = []
-    for line in text.strip().split("\n"):
-        row = np.array(list(map(lambda x: int(x.strip()), re.split(r"\s", line.strip()))))
-        reports.append(row)
+def parse_input(text: str | Iterable[str]) -> tuple[np.ndarray, np.ndarray]:
+    """
+    The reports have different numbers of levels, so they are stored in a matrix with
+    one row per report, padded with zeros to the length of the longest report, along
+    with the number of levels of each report (see get_level_mask). The lines are parsed
+    in chunks of PARSE_CHUNK_SIZE, so only one chunk of them is held in memory at a time.
+    """
+    lines = iter_lines(text)
+    chunks = [parse_reports(chunk) for chunk in iter(lambda: list(itertools.islice(lines, PARSE_CHUNK_SIZE)), [])]
+    width = max((values.shape[1] for values, _ in chunks), default=0)
+    values = np.zeros((sum(len(lengths) for _, lengths in chunks), width), dtype=np.int64)
+    row = 0
+    for chunk_values, chunk_lengths in chunks:
+        values[row:row + len(chunk_lengths), :chunk_values.shape[1]] = chunk_values
+        row += len(chunk_lengths)
 
-    return reports
+    return values, np.concatenate([lengths for _, lengths in chunks] + [np.empty(0, dtype=np.int64)])
+
+
+def get_level_mask(lengths: np.ndarray, width: int) -> np.ndarray:
+    """
+    Which entries of a padded report matrix of the given width are levels.
+    """
+    return np.arange(width) < lengths[:, np.newaxis]
+
+
+def iter_reports(values: np.ndarray, lengths: np.ndarray) -> Iterator[np.ndarray]:
+    for row, length in zip(values, lengths):
+        yield row[:length]
 
 
 def is_report_safe(report: np.array) -> bool:
@@ -30,18 +70,26 @@ def is_report_safe(report: np.array) -> bool:
         return False
 
 
-def find_safe_reports(reports: list[np.array]) -> int:
-    num_safe_reports = 0
-    for report in reports:
-        if is_report_safe(report):
-            num_safe_reports += 1
+def get_safe_report_mask(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    is_report_safe for all reports of a padded report matrix at once. Differences
+    involving padding are ignored, i.e. treated as valid in both directions.
+    """
+    diffs = np.diff(values, axis=1)
+    padding = ~get_level_mask(lengths - 1, diffs.shape[1])
+    increasing = ((diffs >= 1) & (diffs <= 3)) | padding
+    decreasing = ((diffs <= -1) & (diffs >= -3)) | padding
+
+    return increasing.all(axis=1) | decreasing.all(axis=1)
 
-    return num_safe_reports
 
+def find_safe_reports(values: np.ndarray, lengths: np.ndarray) -> int:
+    return int(np.count_nonzero(get_safe_report_mask(values, lengths)))
 
-def find_safe_reports_including_problem_dampener_brute_force(reports: list[np.array]) -> int:
+
+def find_safe_reports_including_problem_dampener_brute_force(values: np.ndarray, lengths: np.ndarray) -> int:
     num_safe_reports = 0
-    for report in reports:
+    for report in iter_reports(values, lengths):
         for idx in range(len(report)):
             corrected_report = np.delete(report, idx)
             if is_report_safe(corrected_report):
@@ -51,9 +99,9 @@ def find_safe_reports_including_problem_dampener_brute_force(reports: list[np.ar
     return num_safe_reports
 
 
-def find_safe_reports_including_problem_dampener(reports: list[np.array]) -> int:
+def find_safe_reports_including_problem_dampener(values: np.ndarray, lengths: np.ndarray) -> int:
     num_safe_reports = 0
-    for report in reports:
+    for report in iter_reports(values, lengths):
         diffs = np.diff(report)
         diff_signs = np.sign(diffs)
         diff_signs_direction = -1 if diff_signs.mean() <= 0 else 1
@@ -76,26 +124,167 @@ def find_safe_reports_including_problem_dampener(reports: list[np.array]) -> int
     return num_safe_reports
 
 
-if __name__ == "__main__":
-    with open("../inputs/02.txt", "r") as fh:
-        in_text = fh.read()
+def get_step_validity(diffs: np.ndarray, direction: int) -> np.ndarray:
+    steps = direction * diffs
+
+    return (steps >= 1) & (steps <= 3)
+
+
+def get_dampened_safe_report_mask(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Which reports are safe after removing at most one level, for all reports of a padded
+    report matrix at once. Removing level r leaves a safe report in a given direction
+    if the levels before r and the levels after r are safe on their own and the
+    difference bridging r is valid. Prefix and suffix validity follow from cumulative
+    ANDs over the valid steps, so each removal is checked with one comparison and the
+    whole dampener is linear in the number of levels.
+    """
+    num_reports, width = values.shape
+    if width < 3:
+        # Removing one of at most two levels always leaves a safe report
+        return np.ones(num_reports, dtype=bool)
+
+    padding = ~get_level_mask(lengths - 1, width - 1)
+    diffs = np.diff(values, axis=1)
+    # Bridging differences when removing levels 1 to width - 2. The bridge over the last
+    # level of a report involves the padding, but isn't needed
+    bridge_diffs = values[:, 2:] - values[:, :-2]
+    no_bridge = np.ones((num_reports, 1), dtype=bool)
+    is_last_level = np.arange(1, width - 1) >= (lengths - 1)[:, np.newaxis]
+    is_level = get_level_mask(lengths, width)
+
+    safe = np.zeros(num_reports, dtype=bool)
+    for direction in (1, -1):
+        valid_steps = get_step_validity(diffs, direction) | padding
+        # valid_before[:, r]: levels 0 to r - 1 are safe, valid_after[:, r]: levels r + 1
+        # to the last one are safe
+        valid_before = np.hstack([no_bridge, no_bridge, np.logical_and.accumulate(valid_steps[:, :-1], axis=1)])
+        valid_after = np.hstack([
+            np.logical_and.accumulate(valid_steps[:, :0:-1], axis=1)[:, ::-1], no_bridge, no_bridge
+        ])
+        valid_bridge = np.hstack([
+            no_bridge, get_step_validity(bridge_diffs, direction) | is_last_level, no_bridge
+        ])
+        safe |= (valid_before & valid_after & valid_bridge & is_level).any(axis=1)
 
-    report_matrix = parse_input(in_text)
+    return safe
+
+
+def get_dampened_safe_report_mask_brute_force(values: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    get_dampened_safe_report_mask by trying every removal, to check it.
+    """
+    return np.array([
+        any(is_report_safe(np.delete(report, idx)) for idx in range(len(report)))
+        for report in iter_reports(values, lengths)
+    ], dtype=bool)
+
+
+def find_safe_reports_including_problem_dampener_linear(values: np.ndarray, lengths: np.ndarray) -> int:
+    return int(np.count_nonzero(get_dampened_safe_report_mask(values, lengths)))
+
+
+def get_min_removals(values: np.ndarray, lengths: np.ndarray, max_removals: int | None = None) -> np.ndarray:
+    """
+    Minimum number of levels to remove from each report of a padded report matrix to make
+    it safe, i.e. its length minus the length of its longest safe subsequence. For each
+    direction, removals[:, j] is the fewest removals among levels 0 to j that leave a
+    safe sequence ending with level j: either all earlier levels are removed, or the
+    levels between a valid predecessor i and j are.
+
+    With max_removals = k, only predecessors up to k + 1 levels back are considered,
+    since longer gaps alone exceed k removals. That makes the DP linear in the report
+    length for a fixed k. Counts larger than k are then not exact and are returned as
+    k + 1.
+    """
+    num_reports, width = values.shape
+    window = width if max_removals is None else max_removals + 1
+    positions = np.arange(width)
+    is_level = get_level_mask(lengths, width)
+    min_removals = np.full(num_reports, width, dtype=np.int64)
+    for direction in (1, -1):
+        removals = np.empty((num_reports, width), dtype=np.int64)
+        for j in range(width):
+            removals_to_j = np.full(num_reports, j, dtype=np.int64)
+            for i in range(max(j - window, 0), j):
+                valid = get_step_validity(values[:, j] - values[:, i], direction)
+                removals_to_j = np.where(valid, np.minimum(removals_to_j, removals[:, i] + j - i - 1), removals_to_j)
+            removals[:, j] = removals_to_j
+        # Levels after the last kept one are removed as well
+        total_removals = np.where(is_level, removals + (lengths - 1)[:, np.newaxis] - positions, width)
+        min_removals = np.minimum(min_removals, total_removals.min(axis=1, initial=width))
+
+    if max_removals is not None:
+        min_removals = np.minimum(min_removals, max_removals + 1)
+
+    return min_removals
+
+
+def get_min_removals_brute_force(values: np.ndarray, lengths: np.ndarray, max_removals: int) -> np.ndarray:
+    """
+    get_min_removals by trying all combinations of up to max_removals removals, to check
+    it. Reports that need more removals get max_removals + 1.
+    """
+    min_removals = []
+    for report in iter_reports(values, lengths):
+        min_removals.append(next(
+            (
+                num_removals
+                for num_removals in range(min(max_removals, len(report)) + 1)
+                for removed in itertools.combinations(range(len(report)), num_removals)
+                if is_report_safe(np.delete(report, removed))
+            ),
+            max_removals + 1,
+        ))
+
+    return np.array(min_removals, dtype=np.int64)
+
+
+def find_safe_reports_with_dampener(values: np.ndarray, lengths: np.ndarray, max_removals: int = 1) -> int:
+    """
+    Number of reports that can be made safe by removing at most max_removals levels.
+    """
+    return int(np.count_nonzero(get_min_removals(values, lengths, max_removals) <= max_removals))
+
+
+if __name__ == "__main__":
+    reports = parse_input(read_lines("../inputs/02.txt"))
 
     # PART 1
     start = time.perf_counter()
-    res = find_safe_reports(report_matrix)
+    res = find_safe_reports(*reports)
     end = time.perf_counter()
     print(f"Part 1 Result: {res}. Took {(end - start) * 1000:.2f} ms.")
 
     # PART 2 (brute force approach)
     start = time.perf_counter()
-    res_brute_force = find_safe_reports_including_problem_dampener_brute_force(report_matrix)
+    res_brute_force = find_safe_reports_including_problem_dampener_brute_force(*reports)
     end = time.perf_counter()
     print(f"Part 2 Brute Force Result: {res_brute_force}. Took {(end - start) * 1000:.2f} ms.")
 
     # PART 2 (refined approach)
     start = time.perf_counter()
-    res = find_safe_reports_including_problem_dampener(report_matrix)
+    res = find_safe_reports_including_problem_dampener(*reports)
     end = time.perf_counter()
     print(f"Part 2 Refined Approach Result: {res}. Took {(end - start) * 1000:.2f} ms.")
+
+    # PART 2 (linear approach)
+    start = time.perf_counter()
+    res = find_safe_reports_including_problem_dampener_linear(*reports)
+    end = time.perf_counter()
+    print(f"Part 2 Linear Approach Result: {res}. Took {(end - start) * 1000:.2f} ms.")
+    assert find_safe_reports_including_problem_dampener_linear(*parse_input(EXAMPLE1)) == 4
+    assert np.array_equal(
+        get_dampened_safe_report_mask(*reports), get_dampened_safe_report_mask_brute_force(*reports)
+    )
+
+    # PART 2 (k-level dampener)
+    for k in (1, 2, 3):
+        start = time.perf_counter()
+        res = find_safe_reports_with_dampener(*reports, max_removals=k)
+        end = time.perf_counter()
+        print(f"Part 2 Result for up to {k} removals: {res}. Took {(end - start) * 1000:.2f} ms.")
+    assert find_safe_reports_with_dampener(*parse_input(EXAMPLE1), max_removals=1) == 4
+    assert np.array_equal(get_min_removals(*reports, max_removals=2), get_min_removals_brute_force(*reports, 2))
+    example_reports = parse_input(EXAMPLE1)
+    assert np.array_equal(get_min_removals(*example_reports), get_min_removals_brute_force(*example_reports, 5))
@@ -1,5 +1,14 @@
+import math
+import mmap
+import os
 import re
+import tempfile
 import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from line_reader import iter_lines, read_text_chunks
 
 EXAMPLE1 = """
 xmul(2,4)%&mul[3,7]!@^do_not_mul(5,5)+mul(32,64]then(mul(11,8)mul(8,5))
@@ -9,12 +18,239 @@ EXAMPLE2 = """
 xmul(2,4)&mul[3,7]!^don't()_mul(5,5)+mul(32,64](mul(11,8)undo()?mul(8,5))
 """
 
-def parse_input(text: str) -> str:
-    input = ""
-    for line in text.strip().split("\n"):
-        input += line.strip()
+# Multi-byte characters next to tokens, and tokens and whitespace across line breaks,
+# to check the chunked scans at every possible chunk boundary
+EXAMPLE3 = """
+xmul(2,4)é&don't()_mul(5,é
+mul(11,8)dü do()ümul(8,5))  é
+  mul(3
+,4)don't
+()mul(7,7)é
+"""
+
+TOKEN_PATTERN = re.compile(r"mul\((\d+),(\d+)\)|(do\(\))|(don't\(\))")
+
+# Text at the end of a chunk that may still turn into a token with the next chunk
+PARTIAL_TOKEN_PATTERN = re.compile(r"(?:m(?:u(?:l(?:\((?:\d+(?:,\d*)?)?)?)?)?|d(?:o(?:n(?:'(?:t\(?)?)?|\()?)?)\Z")
+
+# Characters no token can extend beyond: the ones that don't occur in tokens, and the
+# closing parenthesis that ends every token
+SEPARATOR_PATTERN = re.compile(r"[^mul(,\ddon't]|\)")
+
+# Bytes of the memory evaluated per task by scan_memory_parallel
+PARALLEL_CHUNK_SIZE = 64 * 1024 ** 2
+
+
+def parse_input(text: str | Iterable[str]) -> str:
+    return "".join(iter_lines(text))
+
+
+def iter_joined_lines(chunks: Iterable[str]) -> Iterator[str]:
+    """
+    Streaming version of parse_input for text split at arbitrary positions: yields the
+    pieces of the stripped lines, joined without line breaks. Whitespace at the end of a
+    chunk is held back until it is known whether a line break follows.
+    """
+    pending_whitespace = ""
+    at_line_start = True
+    for chunk in chunks:
+        pieces = (pending_whitespace + chunk).split("\n")
+        pending_whitespace = ""
+        for i, piece in enumerate(pieces):
+            if i > 0:
+                at_line_start = True
+            if at_line_start:
+                piece = piece.lstrip()
+            if i < len(pieces) - 1:
+                yield piece.rstrip()
+            elif piece:
+                stripped_piece = piece.rstrip()
+                pending_whitespace = piece[len(stripped_piece):]
+                if stripped_piece:
+                    at_line_start = False
+                    yield stripped_piece
+
+
+def scan_memory(memory: str | Iterable[str]) -> tuple[int, int]:
+    """
+    Sums of all multiplications and of the enabled ones (see find_active_sections), in a
+    single pass over the memory. It is given either as the output of parse_input or as
+    chunks of the raw text, e.g. read_text_chunks(path). A token that is split between
+    chunks is completed with the next one, so apart from such a partial token only one
+    chunk is in memory at a time.
+    """
+    chunks = [memory] if isinstance(memory, str) else iter_joined_lines(memory)
+    total = enabled_total = 0
+    enabled = True
+    carry = ""
+    for chunk in chunks:
+        buffer = carry + chunk
+        end = 0
+        for match in TOKEN_PATTERN.finditer(buffer):
+            x, y, do, dont = match.groups()
+            if do:
+                enabled = True
+            elif dont:
+                enabled = False
+            else:
+                product = int(x) * int(y)
+                total += product
+                if enabled:
+                    enabled_total += product
+            end = match.end()
+        partial_token = PARTIAL_TOKEN_PATTERN.search(buffer, end)
+        carry = partial_token.group() if partial_token else ""
+
+    return total, enabled_total
+
+
+def evaluate_tokens(memory: str) -> tuple[int, int, int, bool | None]:
+    """
+    Sum of all multiplications, the sum of those before the first do() or don't() (which
+    are enabled only if the memory is entered enabled), the sum of the enabled ones after
+    it, and the enable state at the end (None if there is no do() or don't()).
+    """
+    total = leading_total = enabled_total = 0
+    enabled = None
+    for x, y, do, dont in TOKEN_PATTERN.findall(memory):
+        if do:
+            enabled = True
+        elif dont:
+            enabled = False
+        else:
+            product = int(x) * int(y)
+            total += product
+            if enabled is None:
+                leading_total += product
+            elif enabled:
+                enabled_total += product
+
+    return total, leading_total, enabled_total, enabled
+
+
+def summarize_chunk(text: str) -> dict:
+    """
+    Evaluate a chunk of the raw text independently of its neighbors. No token can span
+    a separator (see SEPARATOR_PATTERN), so the stripped and joined text (see
+    parse_input) between the first and the last separator is evaluated right away,
+    for either enable state at its start. The head before the first and the tail after
+    the last separator may form tokens with the neighboring chunks and are returned
+    as is, as is the whitespace at both ends, which is dropped if it's next to a line
+    break in the whole text. If the chunk has no separator, it is all head.
+    """
+    content = text.strip()
+    if not content:
+        return {"whitespace": text}
+    leading_whitespace = text[:len(text) - len(text.lstrip())]
+    trailing_whitespace = text[len(text.rstrip()):]
+    memory = "".join(iter_joined_lines([content]))
+
+    first_separator = SEPARATOR_PATTERN.search(memory)
+    if first_separator is None:
+        return {"leading_whitespace": leading_whitespace, "head": memory, "trailing_whitespace": trailing_whitespace}
+    # Searching the reversed memory finds the last separator, since all are single characters
+    head_end = first_separator.end()
+    tail_start = len(memory) - SEPARATOR_PATTERN.search(memory[::-1]).start()
+
+    return {
+        "leading_whitespace": leading_whitespace,
+        "head": memory[:head_end],
+        "body": evaluate_tokens(memory[head_end:tail_start]),
+        "tail": memory[tail_start:],
+        "trailing_whitespace": trailing_whitespace,
+    }
 
-    return input
+
+def summarize_file_range(path: str | Path, start: int, end: int) -> dict:
+    with open(path, "rb") as fh, mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        return summarize_chunk(mm[start:end].decode())
+
+
+def combine_chunk_summaries(summaries: Iterable[dict]) -> tuple[int, int]:
+    """
+    Sums of all and of the enabled multiplications of the whole memory from the
+    summaries of its consecutive chunks, scanning the enable state from chunk to chunk.
+    The text between the last separator of a chunk and the first separator of the next
+    one (or further, if chunks have none) is evaluated here, with the whitespace between
+    the chunks kept only if it contains no line break and isn't at either end of the text.
+    """
+    total = enabled_total = 0
+    enabled = True
+    pending_memory = ""
+    whitespace = ""
+    at_start = True
+
+    def evaluate_pending(memory: str):
+        nonlocal total, enabled_total, enabled
+        memory_total, leading_total, rest_total, final_state = evaluate_tokens(memory)
+        total += memory_total
+        enabled_total += (leading_total if enabled else 0) + rest_total
+        if final_state is not None:
+            enabled = final_state
+
+    for summary in summaries:
+        if "whitespace" in summary:
+            whitespace += summary["whitespace"]
+            continue
+        whitespace += summary["leading_whitespace"]
+        if not at_start and "\n" not in whitespace:
+            pending_memory += whitespace
+        pending_memory += summary["head"]
+        whitespace = summary["trailing_whitespace"]
+        at_start = False
+        if "body" not in summary:
+            continue
+        evaluate_pending(pending_memory)
+        body_total, leading_total, rest_total, final_state = summary["body"]
+        total += body_total
+        enabled_total += (leading_total if enabled else 0) + rest_total
+        if final_state is not None:
+            enabled = final_state
+        pending_memory = summary["tail"]
+    evaluate_pending(pending_memory)
+
+    return total, enabled_total
+
+
+def get_chunk_boundaries(path: str | Path, chunk_size: int) -> list[int]:
+    """
+    Byte offsets splitting the file into chunks of about chunk_size bytes, moved forward
+    to the start of the next UTF-8 character if necessary.
+    """
+    size = os.path.getsize(path)
+    boundaries = [0]
+    with open(path, "rb") as fh:
+        for i in range(1, math.ceil(size / chunk_size)):
+            fh.seek(i * chunk_size)
+            # Continuation bytes of multi-byte characters are 0b10xxxxxx. If the file ends
+            # within the character, there is no boundary after it
+            data = fh.read(4)
+            offset = i * chunk_size + next((j for j, byte in enumerate(data) if byte & 0xC0 != 0x80), len(data))
+            if boundaries[-1] < offset < size:
+                boundaries.append(offset)
+    boundaries.append(size)
+
+    return boundaries
+
+
+def scan_memory_parallel(
+        path: str | Path,
+        chunk_size: int = PARALLEL_CHUNK_SIZE,
+        max_workers: int | None = None,
+) -> tuple[int, int]:
+    """
+    Parallel version of scan_memory for a file: chunks of the memory-mapped file are
+    summarized in a process pool (see summarize_chunk) and combined in order, which
+    gives the same results as evaluating the whole memory sequentially.
+    """
+    boundaries = get_chunk_boundaries(path, chunk_size)
+    if len(boundaries) <= 2:
+        return combine_chunk_summaries([summarize_file_range(path, 0, boundaries[-1])] if boundaries[-1] else [])
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+        summaries = executor.map(
+            summarize_file_range, [path] * (len(boundaries) - 1), boundaries[:-1], boundaries[1:]
+        )
+        return combine_chunk_summaries(summaries)
 
 
 def find_active_sections(memory: str) -> list[str]:
@@ -37,7 +273,33 @@ def add_multiplications(multiplication_statements: list[tuple[int, int]]) -> int
     return result
 
 
+def check_chunked_scans(text: str, max_chunk_size: int = 16):
+    """
+    Check that the streaming and the parallel scans agree with the regex sections (see
+    DAY_PARTS) on the text for all chunk sizes up to max_chunk_size, i.e. for chunk
+    boundaries at every position. The chunks of the parallel scan are cut in bytes.
+    """
+    memory = parse_input(text)
+    expected = (
+        add_multiplications(find_valid_statements(memory)),
+        sum(add_multiplications(find_valid_statements(section)) for section in find_active_sections(memory)),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "memory.txt"
+        path.write_bytes(text.encode())
+        for chunk_size in range(1, max_chunk_size + 1):
+            chunks = [text[i:i + chunk_size] for i in range(0, len(text), chunk_size)]
+            assert scan_memory(chunks) == expected, f"scan_memory, chunk size {chunk_size}"
+            assert combine_chunk_summaries(map(summarize_chunk, chunks)) == expected, f"chunk size {chunk_size}"
+            assert scan_memory_parallel(path, chunk_size, 1) == expected, f"scan_memory_parallel, {chunk_size} bytes"
+
+
 if __name__ == "__main__":
+    check_chunked_scans(EXAMPLE2)
+    check_chunked_scans(EXAMPLE3)
+    # Ending within a multi-byte character at a chunk boundary
+    check_chunked_scans(EXAMPLE3.rstrip())
+
     with open("../inputs/03.txt", "r") as fh:
         in_text = fh.read()
 
@@ -57,3 +319,15 @@ if __name__ == "__main__":
         res += add_multiplications(find_valid_statements(section))
     end = time.perf_counter()
     print(f"Part 2 Result: {res}. Took {(end - start) * 1000:.2f} ms.")
+
+    # BOTH PARTS (single streaming pass)
+    start = time.perf_counter()
+    res = scan_memory(read_text_chunks("../inputs/03.txt"))
+    end = time.perf_counter()
+    print(f"Part 1 and 2 Results: {res}. Took {(end - start) * 1000:.2f} ms.")
+
+    # BOTH PARTS (parallel chunks)
+    start = time.perf_counter()
+    res = scan_memory_parallel("../inputs/03.txt")
+    end = time.perf_counter()
+    print(f"Part 1 and 2 Parallel Results: {res}. Took {(end - start) * 1000:.2f} ms.")
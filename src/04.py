@@ -2,6 +2,8 @@ import time
 
 import numpy as np
 
+from grid import load_grid
+
 EXAMPLE1 = """
 MMMSXXMASM
 MSAMXMSMSA
@@ -20,17 +22,13 @@ VALID_DIAGONAL_NEIGHBORS = [(1, 1), (-1, -1), (1, -1), (-1, 1)]
 
 
 def parse_input(text: str) -> np.array:
-    arr = []
-    for line in text.strip().split("\n"):
-        arr.append(list(line.strip()))
-
-    return np.array(arr)
+    return load_grid(text)
 
 
 def get_num_valid_words_from_starting_point(
         letter_arr: np.array,
         starting_point: tuple[int, int],
-        word="XMAS",
+        word=b"XMAS",
         shift: tuple[int, int] = None
 ) -> int:
     if letter_arr[starting_point] != word[0]:
@@ -69,8 +67,9 @@ def find_num_words(letter_arr: np.array, valid_word_finding_function) -> int:
 
 def is_valid_xmas_cross(letter_arr: np.array, pos: tuple[int, int]) -> int:
     i_max, j_max = letter_arr.shape
+    a, m, s = ord("A"), ord("M"), ord("S")
     if (
-            letter_arr[pos] != "A" or
+            letter_arr[pos] != a or
             pos[0] == 0 or
             pos[0] == i_max - 1 or
             pos[1] == 0 or
@@ -80,12 +79,12 @@ def is_valid_xmas_cross(letter_arr: np.array, pos: tuple[int, int]) -> int:
 
     if (
             (
-                    (letter_arr[pos[0] + 1, pos[1] + 1] == "M" and letter_arr[pos[0] - 1, pos[1] - 1] == "S") or
-                    (letter_arr[pos[0] + 1, pos[1] + 1] == "S" and letter_arr[pos[0] - 1, pos[1] - 1] == "M")
+                    (letter_arr[pos[0] + 1, pos[1] + 1] == m and letter_arr[pos[0] - 1, pos[1] - 1] == s) or
+                    (letter_arr[pos[0] + 1, pos[1] + 1] == s and letter_arr[pos[0] - 1, pos[1] - 1] == m)
             ) and
             (
-                    (letter_arr[pos[0] + 1, pos[1] - 1] == "M" and letter_arr[pos[0] - 1, pos[1] + 1] == "S") or
-                    (letter_arr[pos[0] + 1, pos[1] - 1] == "S" and letter_arr[pos[0] - 1, pos[1] + 1] == "M")
+                    (letter_arr[pos[0] + 1, pos[1] - 1] == m and letter_arr[pos[0] - 1, pos[1] + 1] == s) or
+                    (letter_arr[pos[0] + 1, pos[1] - 1] == s and letter_arr[pos[0] - 1, pos[1] + 1] == m)
             )
     ):
         return 1
@@ -1,7 +1,12 @@
 import time
 
 import numpy as np
-from tqdm import tqdm
+
+import metrics
+from grid import BORDER, find_position, get_neighbor_offsets, load_grid, pad_grid, to_node, to_position
+from lazy_import import lazy_import
+
+tqdm = lazy_import("tqdm")
 
 EXAMPLE1 = """
 ....#.....
@@ -20,93 +25,99 @@ EXAMPLE1 = """
 Direction indices: up = 0, right = 1, down = 2, left = 3
 """
 
+OBSTACLE = ord("#")
+FREE = ord(".")
 
-def parse_input(text: str) -> np.array:
-    mat = []
-    for line in text.strip().split("\n"):
-        mat.append(list(line.strip()))
-
-    return np.array(mat)
-
-
-def translate(direction: int, pos: tuple[int, int]) -> tuple[int, int]:
-    i, j = pos
 
-    if direction == 0:
-        return i - 1, j
-    elif direction == 1:
-        return i, j + 1
-    elif direction == 2:
-        return i + 1, j
-    else:
-        return i, j - 1
+def parse_input(text: str) -> np.array:
+    return load_grid(text)
 
 
-def take_step(
-        direction: int,
-        pos: tuple[int, int],
-        mat: np.array,
-        i_max: int,
-        j_max: int
-) -> tuple[int, np.array]:
-    next_i, next_j = translate(direction, pos)
+def walk_until_leaving(cells: list[int], offsets: list[int], start_node: int) -> set[int]:
+    """
+    Walk the guard through the padded grid (see grid.pad_grid) until it steps onto the
+    border and return all visited cells.
+    """
+    node = start_node
+    direction = 0
+    visited_nodes = {node}
+    while True:
+        next_node = node + offsets[direction]
+        cell = cells[next_node]
+        if cell == OBSTACLE:
+            direction = (direction + 1) % 4
+        elif cell == BORDER:
+            return visited_nodes
+        else:
+            node = next_node
+            visited_nodes.add(node)
 
-    if next_i < 0 or next_i >= i_max or next_j < 0 or next_j >= j_max:
-        raise IndexError
 
-    while mat[next_i, next_j] == "#":
-        direction = (direction + 1) % 4
-        next_i, next_j = translate(direction, pos)
-        if next_i < 0 or next_i >= i_max or next_j < 0 or next_j >= j_max:
-            raise IndexError
+def count_steps(mat: np.array) -> tuple[int, set[tuple[int, int]]]:
+    cells, width = pad_grid(mat, BORDER)
+    start_node = to_node(find_position(mat, "^"), width)
+    visited_nodes = walk_until_leaving(cells, get_neighbor_offsets(width), start_node)
 
-    return direction, (next_i, next_j)
+    return len(visited_nodes), {to_position(node, width) for node in visited_nodes}
 
 
-def count_steps(mat: np.array) -> tuple[int, set[tuple[int, int]]]:
-    i_max, j_max = mat.shape
-    pos = np.argwhere(mat == "^")[0]
+def detect_cycle(cells: list[int], offsets: list[int], start_node: int) -> bool:
+    """
+    The guard walks in a cycle iff it turns at the same cell in the same direction twice.
+    Only turns are recorded, which are much rarer than steps.
+    """
+    node = start_node
     direction = 0
-    steps = 0
-    visited_positions = set()
+    turns = set()
+    num_steps = 0
     while True:
-        visited_positions.add(tuple(pos))
-        try:
-            direction, next_pos = take_step(direction, pos, mat, i_max, j_max)
-        except IndexError:
+        next_node = node + offsets[direction]
+        cell = cells[next_node]
+        if cell == OBSTACLE:
+            turn = node * 4 + direction
+            if turn in turns:
+                is_cycle = True
+                break
+            turns.add(turn)
+            direction = (direction + 1) % 4
+        elif cell == BORDER:
+            is_cycle = False
             break
-        if tuple(next_pos) not in visited_positions:
-            steps += 1
-        pos = next_pos
-
-    return steps + 1, visited_positions  # +1 for the starting position
+        else:
+            node = next_node
+            num_steps += 1
 
+    if metrics.ENABLED:
+        metrics.increment("day06.simulated_obstacles")
+        metrics.increment("day06.steps", num_steps)
+        metrics.observe("day06.steps_per_simulation", num_steps)
 
-def place_obstacle_and_detect_cycle(mat: np.array, obstacle_position: tuple[int, int]) -> int:
-    i_max, j_max = mat.shape
-    pos = np.argwhere(mat == "^")[0]
-    if obstacle_position == tuple(pos):
-        return False
-    mat[obstacle_position] = "#"
-    direction = 0
-    visited_positions = set()
-    while True:
-        visited_positions.add((direction, tuple(pos)))
-        try:
-            direction, next_pos = take_step(direction, pos, mat, i_max, j_max)
-        except IndexError:
-            return False
+    return is_cycle
 
-        if (direction, tuple(next_pos)) in visited_positions:
-            return True
 
-        pos = next_pos
+def place_obstacle_and_detect_cycle(
+        cells: list[int],
+        offsets: list[int],
+        start_node: int,
+        obstacle_node: int,
+) -> bool:
+    if obstacle_node == start_node:
+        return False
+    cells[obstacle_node] = OBSTACLE
+    try:
+        return detect_cycle(cells, offsets, start_node)
+    finally:
+        cells[obstacle_node] = FREE
 
 
 def find_num_cycles(mat: np.array, original_trajectory: set[tuple[int, int]]) -> int:
+    # Obstacles are placed in (and removed from) the same padded grid for all positions
+    cells, width = pad_grid(mat, BORDER)
+    offsets = get_neighbor_offsets(width)
+    start_node = to_node(find_position(mat, "^"), width)
     cycles = 0
-    for pos in tqdm(original_trajectory):
-        if place_obstacle_and_detect_cycle(mat.copy(), pos):
+    for pos in tqdm.tqdm(original_trajectory):
+        if place_obstacle_and_detect_cycle(cells, offsets, start_node, to_node(pos, width)):
             cycles += 1
 
     return cycles
@@ -1,5 +1,8 @@
 import time
-from typing import Callable
+from typing import Callable, Iterable
+
+import metrics
+from line_reader import iter_lines, read_lines
 
 EXAMPLE1 = """
 190: 10 19
@@ -14,9 +17,9 @@ EXAMPLE1 = """
 """
 
 
-def parse_input(text: str) -> list[tuple[int, list[int]]]:
+def parse_input(text: str | Iterable[str]) -> list[tuple[int, list[int]]]:
     out = []
-    for line in text.strip().split("\n"):
+    for line in iter_lines(text):
         lhs, rhs = line.strip().split(":")
         out.append((int(lhs.strip()), list(map(lambda x: int(x.strip()), rhs.strip().split()))))
 
@@ -54,8 +57,11 @@ def check_validity_part_2(equation: tuple[int, list[int]]) -> bool:
     stack = [(rhs[0], 0)]
     i_max = len(rhs) - 1
 
+    is_valid = False
+    num_explored_entries = 0
     while stack:
         num, i = stack.pop(-1)
+        num_explored_entries += 1
         if i < i_max:
             next_num = rhs[i + 1]
             agg_sum = num + next_num
@@ -69,9 +75,14 @@ def check_validity_part_2(equation: tuple[int, list[int]]) -> bool:
                 stack.append((agg_concat, i + 1))
         else:
             if num == lhs:
-                return True
+                is_valid = True
+                break
 
-    return False
+    if metrics.ENABLED:
+        metrics.increment("day07.explored_stack_entries", num_explored_entries)
+        metrics.observe("day07.explored_stack_entries_per_equation", num_explored_entries)
+
+    return is_valid
 
 
 def sum_valid_equations(
@@ -87,10 +98,7 @@ def sum_valid_equations(
 
 
 if __name__ == "__main__":
-    with open("../inputs/07.txt", "r") as fh:
-        in_text = fh.read()
-
-    equations = parse_input(in_text)
+    equations = parse_input(read_lines("../inputs/07.txt"))
 
     # PART 1
     start = time.perf_counter()
@@ -2,6 +2,8 @@ import time
 
 import numpy as np
 
+from grid import get_neighbor_offsets, load_grid, pad_grid, to_node
+
 EXAMPLE1 = """
 89010123
 78121874
@@ -15,49 +17,47 @@ EXAMPLE1 = """
 
 
 def parse_input(text: str) -> np.array:
-    mat = []
-    for line in text.strip().split("\n"):
-        mat.append(list(line.strip()))
-
-    return np.array(mat, dtype=int)
+    return load_grid(text) - ord("0")
 
 
 def find_num_paths_from_starting_position(
-        starting_position: tuple[int, int],
-        topo_grid: np.array,
+        starting_node: int,
+        heights: list[int],
+        offsets: list[int],
         count_only_unique_tops: bool
 ) -> int:
-    i_max, j_max = topo_grid.shape
-
+    """
+    heights is the padded topographic map (see grid.pad_grid). Its border has height 0,
+    which can never be climbed to.
+    """
     num_paths = 0
     visited_tops = set()
-    stack = [starting_position]
+    stack = [starting_node]
     while stack:
-        i, j = stack.pop(-1)
-        neighbors = ((i + 1, j), (i, j + 1), (i - 1, j), (i, j - 1))
-        for n in neighbors:
-            next_i, next_j = n
-            if (
-                    0 <= next_i < i_max and 0 <= next_j < j_max and
-                    topo_grid[next_i, next_j] == topo_grid[i, j] + 1
-            ):
-                if topo_grid[next_i, next_j] == 9:
-                    if (next_i, next_j) not in visited_tops:
+        node = stack.pop(-1)
+        next_height = heights[node] + 1
+        for offset in offsets:
+            neighbor = node + offset
+            if heights[neighbor] == next_height:
+                if next_height == 9:
+                    if neighbor not in visited_tops:
                         num_paths += 1
                         if count_only_unique_tops:
-                            visited_tops.add((next_i, next_j))
+                            visited_tops.add(neighbor)
                 else:
-                    stack.append((next_i, next_j))
+                    stack.append(neighbor)
 
     return num_paths
 
 
 def find_overall_num_paths(grid: np.array, count_only_unique_tops: bool) -> int:
-    starting_positions = np.argwhere(grid == 0)
+    heights, width = pad_grid(grid, 0)
+    offsets = get_neighbor_offsets(width)
     num_paths = 0
-    for sp in starting_positions:
-        # noinspection PyTypeChecker
-        num_paths += find_num_paths_from_starting_position(tuple(sp), grid, count_only_unique_tops)
+    for sp in np.argwhere(grid == 0):
+        num_paths += find_num_paths_from_starting_position(
+            to_node(sp, width), heights, offsets, count_only_unique_tops
+        )
 
     return num_paths
 
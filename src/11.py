@@ -1,11 +1,15 @@
 import math
 import time
 
+from memo import MISSING, Memo, memo_scope
 
 EXAMPLE1 = """
 125 17
 """
 
+# Maximum number of (stone, remaining blinks) pairs stored in the lookup table
+MAX_LOOKUP_SIZE = 1_000_000
+
 
 def parse_input(text: str) -> list[int]:
     return list(map(lambda x : int(x.strip()), text.strip().split(" ")))
@@ -29,25 +33,26 @@ def transform_stone(stone: int) -> list[int]:
 
 def blink_n_times_and_get_number_of_stones_total(stones: list[int], n: int) -> int:
     result = 0
-    lookup = {}
-    for stone in stones:
-        result += blink_n_times_and_get_number_of_stones(stone, n, lookup)
+    # The lookup table is shared by all stones of the row. It is dropped afterwards, so
+    # it isn't worth keeping it in LRU order; once full, new entries just aren't stored
+    with memo_scope("day11_stones", MAX_LOOKUP_SIZE, "cap") as lookup:
+        for stone in stones:
+            result += blink_n_times_and_get_number_of_stones(stone, n, lookup)
 
     return result
 
 
-def blink_n_times_and_get_number_of_stones(start_stone: int, n: int, lookup: dict[tuple[int, int], int]) -> int:
+def blink_n_times_and_get_number_of_stones(start_stone: int, n: int, lookup: Memo) -> int:
     if n == 0:
         return 1
-    try:
-        return lookup[(start_stone, n)]
-    except KeyError:
+    result = lookup.get((start_stone, n))
+    if result is MISSING:
         result = 0
         for stone in transform_stone(start_stone):
             result += blink_n_times_and_get_number_of_stones(stone, n - 1, lookup)
+        lookup.put((start_stone, n), result)
 
-        lookup[(start_stone, n)] = result
-        return result
+    return result
 
 
 if __name__ == "__main__":
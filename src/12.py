@@ -2,6 +2,8 @@ import time
 
 import numpy as np
 
+from grid import BORDER, get_neighbor_offsets, load_grid, pad_grid, to_node
+
 EXAMPLE1 = """
 RRRRIICCFF
 RRRRIICCCF
@@ -15,89 +17,120 @@ MIIISIJEEE
 MMMISSJEEE
 """
 
-DIRECTIONS = {
-    (-1,  0): 0,
-    ( 0,  1): 1,
-    ( 1,  0): 2,
-    ( 0, -1): 3,
-}
-
 
 def parse_input(text: str) -> np.array:
-    mat = []
-    for line in text.strip().split("\n"):
-        mat.append(list(line.strip()))
-
-    return np.array(mat, dtype="U1")
+    return load_grid(text)
 
 
 def explore_region_and_calculate_fencing_cost(
-        starting_point: tuple[int, int],
-        grid: np.array,
-        visited: np.array,
+        starting_node: int,
+        cells: list[int],
+        offsets: list[int],
+        visited: list[bool],
         bulk_discount: bool,
 ) -> int:
-    i_max, j_max = grid.shape
-    if bulk_discount:
-        # Add padding around the grid to avoid index out of bounds
-        # when inspecting a perimeter at the grid edges. We encode
-        # the direction, against which the perimeter shields, in
-        # the third dimension of the is_perimeter array
-        # (0 = up, 1 = right, 2 = down, 3 = left).
-        is_perimeter = np.zeros((i_max + 4, j_max + 4, 4), dtype=bool)
-    queue = [starting_point]
-    region_type = grid[starting_point]
+    """
+    cells is the padded garden grid (see grid.pad_grid), whose border never belongs to a
+    region. With bulk discount, the perimeter is the number of sides. A fence segment
+    (a cell of the region and the direction it shields against) starts a new side,
+    unless the previous cell along the side belongs to the region and has a fence
+    segment in the same direction as well.
+    """
+    region_type = cells[starting_node]
+    visited[starting_node] = True
+    stack = [starting_node]
     region_area = 0
     region_perimeter = 0
-    while queue:
-        i, j = queue.pop(0)
-        if visited[i, j]:
-            continue
-        visited[i, j] = True
+    while stack:
+        node = stack.pop(-1)
         region_area += 1
-        neighbors = ((i + 1, j), (i, j + 1), (i - 1, j), (i, j - 1))
-        for n in neighbors:
-            next_i, next_j = n
-            if 0 <= next_i < i_max and 0 <= next_j < j_max and grid[next_i, next_j] == region_type:
-                queue.append((next_i, next_j))
-            else:
-                if bulk_discount:
-                    direction = DIRECTIONS[next_i - i, next_j - j]
-                    # noinspection PyUnboundLocalVariable
-                    if not (
-                            is_perimeter[next_i + 3, next_j + 2, direction] or
-                            is_perimeter[next_i + 2, next_j + 3, direction] or
-                            is_perimeter[next_i + 1, next_j + 2, direction] or
-                            is_perimeter[next_i + 2, next_j + 1, direction]
-                    ):
-                        region_perimeter += 1
-                    is_perimeter[next_i + 2, next_j + 2, direction] = True
-                else:
+        for direction, offset in enumerate(offsets):
+            neighbor = node + offset
+            if cells[neighbor] == region_type:
+                if not visited[neighbor]:
+                    visited[neighbor] = True
+                    stack.append(neighbor)
+            elif bulk_discount:
+                # The previous cell along sides facing up is the one to the left, along
+                # sides facing right the one above and so on
+                previous = node + offsets[direction - 1]
+                if cells[previous] != region_type or cells[previous + offset] == region_type:
                     region_perimeter += 1
+            else:
+                region_perimeter += 1
 
     return region_area * region_perimeter
 
 
 def calculate_overall_fencing_cost(grid: np.array, bulk_discount: bool) -> int:
-    i_max, j_max = grid.shape
-    visited = np.zeros((i_max, j_max), dtype=bool)
+    cells, width = pad_grid(grid, BORDER)
+    offsets = get_neighbor_offsets(width)
+    visited = [False] * len(cells)
     total_cost = 0
-    for i in range(i_max):
-        for j in range(j_max):
-            if not visited[i, j]:
+    for i in range(grid.shape[0]):
+        for j in range(grid.shape[1]):
+            node = to_node((i, j), width)
+            if not visited[node]:
                 total_cost += explore_region_and_calculate_fencing_cost(
-                    (i, j), grid, visited, bulk_discount
+                    node, cells, offsets, visited, bulk_discount
                 )
 
     return total_cost
 
 
+def calculate_overall_fencing_cost_by_counting_corners(grid: np.array) -> int:
+    """
+    Independent check of the bulk discount cost: a region has as many sides as corners.
+    Each cell has a corner in each of its four diagonal directions if both adjacent
+    cells in that direction are outside the region (convex), or if both are inside but
+    the diagonal one is outside (concave).
+    """
+    num_rows, num_cols = grid.shape
+
+    def plant(i: int, j: int) -> int:
+        return int(grid[i, j]) if 0 <= i < num_rows and 0 <= j < num_cols else -1
+
+    visited = set()
+    total_cost = 0
+    for start in np.ndindex(grid.shape):
+        if start in visited:
+            continue
+        region_type = plant(*start)
+        visited.add(start)
+        stack = [start]
+        region_area = 0
+        num_corners = 0
+        while stack:
+            i, j = stack.pop()
+            region_area += 1
+            for di, dj in ((-1, 0), (0, 1), (1, 0), (0, -1)):
+                neighbor = (i + di, j + dj)
+                if plant(*neighbor) == region_type and neighbor not in visited:
+                    visited.add(neighbor)
+                    stack.append(neighbor)
+            for di, dj in ((-1, -1), (-1, 1), (1, -1), (1, 1)):
+                vertical = plant(i + di, j) == region_type
+                horizontal = plant(i, j + dj) == region_type
+                diagonal = plant(i + di, j + dj) == region_type
+                if (not vertical and not horizontal) or (vertical and horizontal and not diagonal):
+                    num_corners += 1
+        total_cost += region_area * num_corners
+
+    return total_cost
+
+
 if __name__ == "__main__":
     with open("../inputs/12.txt", "r") as fh:
         in_text = fh.read()
 
     garden_grid = parse_input(in_text)
 
+    # CHECKS (the sides were counted wrongly for some fence layouts before)
+    assert calculate_overall_fencing_cost(parse_input(EXAMPLE1), True) == 1206
+    assert calculate_overall_fencing_cost(garden_grid, True) == calculate_overall_fencing_cost_by_counting_corners(
+        garden_grid
+    )
+
     # PART 1
     start = time.perf_counter()
     res = calculate_overall_fencing_cost(garden_grid, False)
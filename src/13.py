@@ -2,11 +2,14 @@ import math
 import re
 import time
 
-from sympy import And
-from sympy.abc import x, y
-# noinspection PyProtectedMember
-from sympy.solvers.diophantine.diophantine import diop_linear
-from sympy.solvers.inequalities import reduce_rational_inequalities
+from lazy_import import lazy_import
+
+# sympy is only needed in the rare case of parallel button shifts, so we
+# don't want to pay for its import whenever the module is loaded
+sympy = lazy_import("sympy")
+sympy_abc = lazy_import("sympy.abc")
+diophantine = lazy_import("sympy.solvers.diophantine.diophantine")
+inequalities = lazy_import("sympy.solvers.inequalities")
 
 EXAMPLE1 = """
 Button A: X+94, Y+34
@@ -40,14 +43,16 @@ def parse_input(text: str) -> list[tuple[tuple[int, int], tuple[int, int], tuple
 
 
 def solve_diophantine_equation(a: int, b: int, c: int) -> int:
-    sol = diop_linear(a * x + b * y - c)
+    x, y = sympy_abc.x, sympy_abc.y
+    # noinspection PyProtectedMember
+    sol = diophantine.diop_linear(a * x + b * y - c)
     k = sol.free_symbols.pop()
     # The solution is a parametrized set of points of the form (x0 + k * b, y0 - k * a),
     # where k is an arbitrary integer. We only accept solutions that have non-negative
     # values and pick from these the one with the lowest cost 3 * x[0] + x[1]
-    k_range_x = reduce_rational_inequalities([[sol[0] >= 0]], k)
-    k_range_y = reduce_rational_inequalities([[sol[1] >= 0]], k)
-    valid_k_values = And(k_range_y, k_range_x).as_set()
+    k_range_x = inequalities.reduce_rational_inequalities([[sol[0] >= 0]], k)
+    k_range_y = inequalities.reduce_rational_inequalities([[sol[1] >= 0]], k)
+    valid_k_values = sympy.And(k_range_y, k_range_x).as_set()
     if valid_k_values.is_empty:
         return 0
     candidates = [sol.subs({k: i}) for i in range(valid_k_values.left, valid_k_values.right + 1)]
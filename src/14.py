@@ -3,7 +3,10 @@ import re
 import time
 
 import numpy as np
-import skimage
+
+from lazy_import import lazy_import
+
+skimage = lazy_import("skimage")
 
 EXAMPLE1 = """
 p=0,4 v=3,-3
@@ -3,6 +3,8 @@ from collections.abc import Callable
 
 import numpy as np
 
+from grid import get_neighbor_offsets, load_grid, pad_grid
+
 EXAMPLE1 = """
 ########
 #..O.O.#
@@ -41,167 +43,113 @@ v^^>>><<^^<>>^v^<v^vv<>v^<<>^<^v^v><^<<<><<^<v><v<>vv>>v><v^<vv<>v^<<^
 """
 
 
-def parse_input(text: str) -> tuple[np.array, list[str]]:
-    grid_block, instructions_block = text.strip().split("\n\n")
+WALL, FREE, ROBOT, BOX, BOX_LEFT, BOX_RIGHT = map(ord, "#.@O[]")
+BOXES = (BOX, BOX_LEFT, BOX_RIGHT)
 
-    grid_list = []
-    for line in grid_block.strip().split("\n"):
-        grid_list.append(list(line.strip()))
 
+def parse_input(text: str) -> tuple[np.array, list[str]]:
+    grid_block, instructions_block = text.strip().split("\n\n")
     instructions = list(instructions_block.strip().replace("\n", ""))
 
-    return np.array(grid_list, dtype=str), instructions
+    return load_grid(grid_block), instructions
 
 
 def sum_gps_coordinates_after_robot_moving(
         grid: np.array,
         instructions: list[str],
-        push_boxes_callback:Callable[[np.array, tuple[int, int], tuple[int, int], str], tuple[int, int]],
+        push_boxes_callback: Callable[[list[int], int, int], int],
         box_identifier: str
 ) -> int:
-    grid = grid.copy()
-    navigate_robot(grid, instructions, push_boxes_callback)
+    cells, width = pad_grid(grid, WALL)
+    navigate_robot(cells, width, instructions, push_boxes_callback)
+    grid = np.array(cells, dtype=np.uint8).reshape(-1, width)[1:-1, 1:-1]
 
-    return (np.argwhere(grid == box_identifier) * np.array([100, 1])).sum()
-
-
-def move(position: tuple[int, int], direction: str) -> tuple[int, int]:
-    i, j = position
-    if direction == "^":
-        return i - 1, j
-    elif direction == "v":
-        return i + 1, j
-    elif direction == "<":
-        return i, j - 1
-    elif direction == ">":
-        return i, j + 1
-    else:
-        raise ValueError(f"Unknown direction: {direction}")
+    return (np.argwhere(grid == ord(box_identifier)) * np.array([100, 1])).sum()
 
 
 def navigate_robot(
-        grid: np.array,
+        cells: list[int],
+        width: int,
         instructions: list[str],
-        push_boxes_callback: Callable[[np.array, tuple[int, int], tuple[int, int], str], tuple[int, int]],
+        push_boxes_callback: Callable[[list[int], int, int], int],
 ):
-    pos = tuple(np.argwhere(grid == "@")[0])
+    """
+    cells is the padded warehouse grid (see grid.pad_grid). Every instruction becomes
+    the offset of a step, so that the robot and the boxes are moved by index arithmetic.
+    """
+    steps = dict(zip("^>v<", get_neighbor_offsets(width)))
+    node = cells.index(ROBOT)
     for instruction in instructions:
-        next_pos = move(pos, instruction)
-        if grid[next_pos] == ".":
-            grid[pos] = "."
-            grid[next_pos] = "@"
-            pos = next_pos
-        elif grid[next_pos] in ("O", "[", "]"):
-            pos = push_boxes_callback(grid, pos, next_pos, instruction)
-
-
-def push_boxes_part_1(
-        grid: np.array,
-        robot_pos: tuple[int, int],
-        first_box_pos: tuple[int, int],
-        instruction: str
-) -> tuple[int, int]:
-    next_pos = first_box_pos
-    row_positions = [robot_pos, first_box_pos]
-    while grid[next_pos] in ("O", "[", "]"):
-        next_pos = move(next_pos, instruction)
-        row_positions.append(next_pos)
-        if grid[next_pos] == ".":
-            source_indices_i = [p[0] for p in row_positions[0: -1]]
-            source_indices_j = [p[1] for p in row_positions[0: -1]]
-            target_indices_i = [p[0] for p in row_positions[1:]]
-            target_indices_j = [p[1] for p in row_positions[1:]]
-            grid[target_indices_i, target_indices_j] = grid[source_indices_i, source_indices_j]
-            grid[row_positions.pop(0)] = "."
-            break
-
-    return row_positions[0]
-
-
-def push_boxes_part_2(
-        grid: np.array,
-        robot_pos: tuple[int, int],
-        first_box_pos: tuple[int, int],
-        instruction: str
-) -> tuple[int, int]:
-    if instruction in ("<", ">"):
-        return push_boxes_part_1(grid, robot_pos, first_box_pos, instruction)
-
-    next_layer_seed = first_box_pos
-    next_robot_pos = robot_pos
-    cluster_positions = {0: {robot_pos}}
-    l = 1
-    get_full_cluster_layer(cluster_positions, grid, next_layer_seed, l)
-    while is_not_blocked(grid, cluster_positions[l], instruction):
-        if is_free_space(grid, cluster_positions[l], instruction):
-            if instruction == "^":
-                for layer in reversed(cluster_positions.values()):
-                    for pos in layer:
-                        grid[pos[0] - 1, pos[1]] = grid[pos]
-                        grid[pos] = "."
-                next_robot_pos = (next_robot_pos[0] - 1, next_robot_pos[1])
-            elif instruction == "v":
-                for layer in reversed(cluster_positions.values()):
-                    for pos in layer:
-                        grid[pos[0] + 1, pos[1]] = grid[pos]
-                        grid[pos] = "."
-                next_robot_pos = (next_robot_pos[0] + 1, next_robot_pos[1])
-            break
-        l += 1
-        next_layer_seed = move(next_layer_seed, instruction)
-        get_full_cluster_layer(cluster_positions, grid, next_layer_seed, l)
-
-    return next_robot_pos
-
-
-def get_full_cluster_layer(
-        cluster_positions: dict[int, set[tuple[int, int]]],
-        grid: np.array,
-        layer_seed: tuple[int, int],
-        layer: int
-):
-    cluster_positions[layer] = set()
-    i_next, _ = layer_seed
-    for i, j in cluster_positions[layer - 1]:
-        if grid[i_next, j] in ("[", "]"):
-            cluster_positions[layer].add((i_next, j))
-        if grid[i_next, j + 1] == "]" and (i, j + 1) not in cluster_positions[layer - 1]:
-            cluster_positions[layer].add((i_next, j + 1))
-        if grid[i_next, j - 1] == "[" and (i, j - 1) not in cluster_positions[layer - 1]:
-            cluster_positions[layer].add((i_next, j - 1))
-
-
-def is_not_blocked(grid: np.array, cluster_positions_layer: set[tuple[int, int]], direction: str) -> bool:
-    if direction == "^":
-        return all([grid[p[0] - 1, p[1]] != "#" for p in cluster_positions_layer])
-    elif direction == "v":
-        return all([grid[p[0] + 1, p[1]] != "#" for p in cluster_positions_layer])
-
-
-def is_free_space(grid: np.array, cluster_positions_layer: set[tuple[int, int]], direction: str) -> bool:
-    if direction == "^":
-        return all([grid[p[0] - 1, p[1]] == "." for p in cluster_positions_layer])
-    elif direction == "v":
-        return all([grid[p[0] + 1, p[1]] == "." for p in cluster_positions_layer])
+        step = steps[instruction]
+        next_node = node + step
+        if cells[next_node] == FREE:
+            cells[node] = FREE
+            cells[next_node] = ROBOT
+            node = next_node
+        elif cells[next_node] in BOXES:
+            node = push_boxes_callback(cells, node, step)
+
+
+def push_boxes_part_1(cells: list[int], robot_node: int, step: int) -> int:
+    """
+    Push the row of boxes in front of the robot by one step, if there is free space
+    behind it. Returns the new position of the robot.
+    """
+    end_node = robot_node + step
+    while cells[end_node] in BOXES:
+        end_node += step
+    if cells[end_node] != FREE:
+        return robot_node
+
+    for node in range(end_node, robot_node, -step):
+        cells[node] = cells[node - step]
+    cells[robot_node] = FREE
+
+    return robot_node + step
+
+
+def push_boxes_part_2(cells: list[int], robot_node: int, step: int) -> int:
+    """
+    Horizontal pushes work as in part 1. For vertical pushes, collect all cells that
+    are pushed, row by row, and move them if none of them is blocked by a wall.
+    """
+    if step in (-1, 1):
+        return push_boxes_part_1(cells, robot_node, step)
+
+    # Since each box is added together with its other half, the cells are collected in
+    # order of their distance from the robot
+    pushed_nodes = [robot_node]
+    seen_nodes = {robot_node}
+    for node in pushed_nodes:
+        next_node = node + step
+        cell = cells[next_node]
+        if cell == WALL:
+            return robot_node
+        if cell == BOX_LEFT:
+            box_nodes = (next_node, next_node + 1)
+        elif cell == BOX_RIGHT:
+            box_nodes = (next_node, next_node - 1)
+        else:
+            continue
+        for box_node in box_nodes:
+            if box_node not in seen_nodes:
+                seen_nodes.add(box_node)
+                pushed_nodes.append(box_node)
+
+    # Move the farthest cells first, so that no cell is overwritten before it is moved
+    for node in reversed(pushed_nodes):
+        cells[node + step] = cells[node]
+        cells[node] = FREE
+
+    return robot_node + step
 
 
 def create_wider_warehouse(grid: np.array) -> np.array:
-    i_max, j_max = grid.shape
-    new_grid = np.empty((i_max, j_max * 2), dtype=str)
-    for i, line in enumerate(grid):
-        for j, char in enumerate(line):
-            if char == "#":
-                new_grid[i, 2 * j] = "#"
-                new_grid[i, 2 * j + 1] = "#"
-            elif char == "O":
-                new_grid[i, 2 * j] = "["
-                new_grid[i, 2 * j + 1] = "]"
-            elif char == ".":
-                new_grid[i, 2 * j] = "."
-                new_grid[i, 2 * j + 1] = "."
-            elif char == "@":
-                new_grid[i, 2 * j] = "@"
-                new_grid[i, 2 * j + 1] = "."
+    # Walls and free tiles just get doubled. Boxes become "[]" and the robot "@."
+    new_grid = np.repeat(grid, 2, axis=1)
+    new_grid[:, 0::2][grid == BOX] = BOX_LEFT
+    new_grid[:, 1::2][grid == BOX] = BOX_RIGHT
+    new_grid[:, 1::2][grid == ROBOT] = FREE
 
     return new_grid
 
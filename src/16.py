@@ -1,8 +1,10 @@
 import time
-from queue import PriorityQueue
 
 import numpy as np
 
+from grid import find_position, get_neighbor_offsets, load_grid, pad_grid, to_node
+from shortest_path import dijkstra
+
 EXAMPLE1 = """
 ###############
 #.......#....E#
@@ -49,32 +51,10 @@ ORIENTATIONS = [
     {0, 2, 3},
 ]
 
-DISPLACEMENTS = [
-    (lambda c: (c[0] - 1, c[1])),
-    (lambda c: (c[0], c[1] + 1)),
-    (lambda c: (c[0] + 1, c[1])),
-    (lambda c: (c[0], c[1] - 1)),
-]
-
 def parse_input(text: str) -> tuple[np.array, tuple[int, int], tuple[int, int]]:
-    mat = []
-    start_pos = end_pos = None
-    for i, line in enumerate(text.strip().split("\n")):
-        row = []
-        for j, char in enumerate(line.strip()):
-            if char == ".":
-                row.append(0)
-            elif char == "#":
-                row.append(1)
-            elif char == "S":
-                row.append(0)
-                start_pos = (i, j)
-            elif char == "E":
-                row.append(0)
-                end_pos = (i, j)
-        mat.append(row)
-
-    return np.array(mat, dtype=bool), start_pos, end_pos
+    grid = load_grid(text)
+
+    return grid == ord("#"), find_position(grid, "S"), find_position(grid, "E")
 
 
 def find_all_shortest_paths_dijkstra(
@@ -82,52 +62,42 @@ def find_all_shortest_paths_dijkstra(
         start_coords: tuple[int, int],
         target_coords: tuple[int, int],
 ) -> tuple[int, int]:
-    min_candidates = []
-
-    nodes_to_visit = PriorityQueue()
-    # Item structure of nodes_to_visit:
-    # tuple(
-    #     distance, tuple(
-    #         list(<node history>),
-    #         <from which direction was the node entered>
-    #     )
-    # )
-    nodes_to_visit.put((0, ([start_coords], 1)))
-    visited_nodes = {}
-
-    while nodes_to_visit.queue:
-        current_distance, (node_history, last_direction) = nodes_to_visit.get()
-        current_coords = node_history[-1]
-        if visited_nodes.get((current_coords, last_direction), np.inf) < current_distance:
-            # We reject to re-inspect the node if a shorter path to it is already known,
-            # but NOT if there is an already another known path of the same length
-            continue
-        if current_coords == target_coords:
-            if not min_candidates or current_distance <= min(min_candidates, key=lambda x: x[0])[0]:
-                min_candidates.append((current_distance, node_history))
-            else:
-                # Shortest paths are always found first
-                break
+    """
+    The nodes of the search are (cell, direction) pairs, where direction is the direction
+    in which the reindeer entered the cell. Moving on in the same direction costs 1, turning
+    by 90 degrees and moving on costs 1001. Turning by 180 degrees can never be part of a
+    shortest path, so it isn't considered.
+    """
+    walls, width = pad_grid(grid, True)
+    offsets = get_neighbor_offsets(width)
+
+    def get_neighbors(node: int) -> list[tuple[int, int]]:
+        cell, last_direction = divmod(node, 4)
+        neighbors = []
         for next_dir in ORIENTATIONS[last_direction]:
-            if next_dir == last_direction:
-                step_cost = 1
-            else:
-                step_cost = 1001
-            next_coords = DISPLACEMENTS[next_dir](current_coords)
-            if visited_nodes.get((next_coords, next_dir)) is None:
-                # Node hasn't already been visited
-                if not grid[next_coords]:
-                    # Note that here, a reindeer is considered to be stuck in a dead end
-                    # and its path can't be continued. Although in reality, it might turn
-                    # by 180 degrees and go back, such a move can't result in a shortest
-                    # path anymore. Therefore, it is safe to ignore these paths
-                    nodes_to_visit.put((current_distance + step_cost, (node_history + [next_coords], next_dir)))
-
-        visited_nodes[(current_coords, last_direction)] = current_distance
-
-    shortest_path_length = min(min_candidates, key=lambda x: x[0])[0]
-    shortest_paths = [item[1] for item in min_candidates if item[0] == shortest_path_length]
-    num_visited_nodes_on_all_shortest_paths = len(set([coords for path in shortest_paths for coords in path]))
+            next_cell = cell + offsets[next_dir]
+            if not walls[next_cell]:
+                neighbors.append((next_cell * 4 + next_dir, 1 if next_dir == last_direction else 1001))
+
+        return neighbors
+
+    start_node = to_node(start_coords, width) * 4 + 1
+    target_cell = to_node(target_coords, width)
+    target_nodes = [target_cell * 4 + direction for direction in range(4)]
+    distances, predecessors = dijkstra(
+        len(walls) * 4, [start_node], get_neighbors, target_nodes, track_predecessors=True
+    )
+
+    shortest_path_length = min(distances[node] for node in target_nodes)
+    # Walk back from the target along all shortest paths and collect the visited cells
+    nodes_on_shortest_paths = {node for node in target_nodes if distances[node] == shortest_path_length}
+    stack = list(nodes_on_shortest_paths)
+    while stack:
+        for predecessor in predecessors[stack.pop(-1)]:
+            if predecessor not in nodes_on_shortest_paths:
+                nodes_on_shortest_paths.add(predecessor)
+                stack.append(predecessor)
+    num_visited_nodes_on_all_shortest_paths = len({node // 4 for node in nodes_on_shortest_paths})
 
     return shortest_path_length, num_visited_nodes_on_all_shortest_paths
 
@@ -1,5 +1,11 @@
 import time
-from queue import PriorityQueue
+from typing import Iterable
+
+import numpy as np
+
+from grid import get_neighbor_offsets, pad_grid, to_node
+from line_reader import iter_lines, read_lines
+from shortest_path import bfs
 
 EXAMPLE1 = """
 5,4
@@ -34,9 +40,9 @@ class PathNotFoundError(Exception):
     pass
 
 
-def parse_input(text: str) -> list[tuple[int, int]]:
+def parse_input(text: str | Iterable[str]) -> list[tuple[int, int]]:
     coords = []
-    for lines in text.strip().split("\n"):
+    for lines in iter_lines(text):
         coords.append(tuple(map(lambda x: int(x.strip()), lines.strip().split(","))))
 
     # noinspection PyTypeChecker
@@ -50,40 +56,22 @@ def find_shortest_path(
         grid_size: int,
         num_already_fallen_bytes: int
 ) -> int:
-    blocked_grid_coords = set(byte_coords[:num_already_fallen_bytes])
-
-    unvisited_nodes = PriorityQueue()
-    # Item structure of unvisited_nodes:
-    # Tuple(distance, Tuple(<node coordinates on the grid>))
-    unvisited_nodes.put((0, start_coords))
-    visited_nodes = {}
-
-    while unvisited_nodes.queue:
-        current_distance, current_coords = unvisited_nodes.get()
-        if visited_nodes.get(current_coords) is not None:
-            # Node has already been visited
-            continue
-        if current_coords == target_coords:
-            return current_distance
-        neighbors = [
-            (current_coords[0] + 1, current_coords[1]),
-            (current_coords[0] - 1, current_coords[1]),
-            (current_coords[0], current_coords[1] + 1),
-            (current_coords[0], current_coords[1] - 1)
-        ]
-        for next_coords in neighbors:
-            if visited_nodes.get(next_coords) is None:
-                # Node hasn't already been visited
-                if (
-                        0 <= next_coords[0] < grid_size and 0 <= next_coords[1] < grid_size and
-                        next_coords not in blocked_grid_coords
-                ):
-                    new_distance = current_distance + 1
-                    unvisited_nodes.put((new_distance, next_coords))
+    blocked = np.zeros((grid_size, grid_size), dtype=bool)
+    fallen_bytes = byte_coords[:num_already_fallen_bytes]
+    if fallen_bytes:
+        blocked[tuple(np.array(fallen_bytes).T)] = True
+    blocked_cells, width = pad_grid(blocked, True)
+    offsets = get_neighbor_offsets(width)
 
-        visited_nodes[current_coords] = current_distance
+    def get_neighbors(node: int) -> list[int]:
+        return [node + offset for offset in offsets if not blocked_cells[node + offset]]
 
-    raise PathNotFoundError("No path found.")
+    target_node = to_node(target_coords, width)
+    distances = bfs(len(blocked_cells), [to_node(start_coords, width)], get_neighbors, target_node)
+    if distances[target_node] < 0:
+        raise PathNotFoundError("No path found.")
+
+    return distances[target_node]
 
 
 def find_first_blocking_byte(
@@ -104,10 +92,7 @@ def find_first_blocking_byte(
 
 
 if __name__ == "__main__":
-    with open("../inputs/18.txt", "r") as fh:
-        in_text = fh.read()
-
-    byte_positions = parse_input(in_text)
+    byte_positions = parse_input(read_lines("../inputs/18.txt"))
 
     # PART 1
     start = time.perf_counter()
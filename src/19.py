@@ -1,5 +1,7 @@
 import time
 
+from memo import MISSING, Memo, memo_scope
+
 EXAMPLE1 = """
 r, wr, b, g, bwu, rb, gb, br
 
@@ -13,6 +15,9 @@ brgr
 bbrgwb
 """
 
+# Maximum number of sub-designs stored in the lookup table
+MAX_LOOKUP_SIZE = 1_000_000
+
 
 def parse_input(text: str) -> tuple[set[str], list[str]]:
     towels_text, designs_text = text.strip().split("\n\n")
@@ -43,7 +48,7 @@ def is_design_possible(design: str, towels: set[str]) -> bool:
 def get_num_possibilities_to_create_design(
         design: str,
         towels: set[str],
-        sub_design_possibilities: dict[str, int]
+        sub_design_possibilities: Memo
 ) -> int:
     num_possibilities = 0
     for towel in towels:
@@ -52,13 +57,13 @@ def get_num_possibilities_to_create_design(
             if sub_design == "":
                 num_possibilities += 1
             else:
-                try:
-                    num_possibilities += sub_design_possibilities[sub_design]
-                except KeyError:
-                    num_possibilities += get_num_possibilities_to_create_design(
+                sub_design_num_possibilities = sub_design_possibilities.get(sub_design)
+                if sub_design_num_possibilities is MISSING:
+                    sub_design_num_possibilities = get_num_possibilities_to_create_design(
                         sub_design, towels, sub_design_possibilities
                     )
-    sub_design_possibilities[design] = num_possibilities
+                num_possibilities += sub_design_num_possibilities
+    sub_design_possibilities.put(design, num_possibilities)
 
     return num_possibilities
 
@@ -74,8 +79,12 @@ def get_num_possible_designs(towels: set[str], designs: list[str]) -> int:
 
 def get_overall_num_possibilities_to_create_designs(towels: set[str], designs: list[str]) -> int:
     num_overall_designs = 0
-    for design in designs:
-        num_overall_designs += get_num_possibilities_to_create_design(design, towels, {})
+    # The number of possibilities of a sub-design only depends on the towels, so the
+    # lookup table is shared by all designs of the input. It only lives for one input, so
+    # it is capped rather than kept in LRU order
+    with memo_scope("day19_sub_designs", MAX_LOOKUP_SIZE, "cap") as sub_design_possibilities:
+        for design in designs:
+            num_overall_designs += get_num_possibilities_to_create_design(design, towels, sub_design_possibilities)
 
     return num_overall_designs
 
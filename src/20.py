@@ -1,8 +1,10 @@
 import time
-from queue import PriorityQueue
 
 import numpy as np
 
+from grid import find_position, get_neighbor_offsets, load_grid, pad_grid, to_node
+from shortest_path import local_bfs
+
 EXAMPLE1 = """
 ###############
 #...#...#.....#
@@ -21,91 +23,73 @@ EXAMPLE1 = """
 ###############
 """
 
+TRACK, WALL, OUTSIDE = 0, 1, 2
+
 
 def parse_input(text: str) -> tuple[np.array, tuple[int, int], tuple[int, int]]:
-    mat = []
-    start_pos = end_pos = None
-    for i, line in enumerate(text.strip().split("\n")):
-        row = []
-        for j, char in enumerate(line.strip()):
-            if char == ".":
-                row.append(0)
-            elif char == "#":
-                row.append(1)
-            elif char == "S":
-                row.append(0)
-                start_pos = (i, j)
-            elif char == "E":
-                row.append(0)
-                end_pos = (i, j)
-        mat.append(row)
-
-    return np.array(mat, dtype=bool), start_pos, end_pos
+    grid = load_grid(text)
+
+    return grid == ord("#"), find_position(grid, "S"), find_position(grid, "E")
 
 
 def take_step(
-        position: tuple[int, int],
-        grid: np.array,
-        visited: set[tuple[int, int]] | dict[tuple[int, int], int]
-) -> tuple[int, int]:
-    for neighbor in [
-        (position[0] + 1, position[1]),
-        (position[0] - 1, position[1]),
-        (position[0], position[1] + 1),
-        (position[0], position[1] - 1),
-    ]:
-        if not grid[neighbor] and neighbor not in visited:
+        node: int,
+        course_cells: list[int],
+        offsets: list[int],
+        visited: set[int],
+) -> int:
+    for offset in offsets:
+        neighbor = node + offset
+        if course_cells[neighbor] == TRACK and neighbor not in visited:
             return neighbor
 
     raise ValueError("Path blocked.")
 
 
+def get_cheat_offsets(width: int, max_cheat_length: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Offsets (in a grid padded with a border of max_cheat_length cells) to all cells that
+    can be reached by a cheat, i.e. within the given Manhattan distance, and their
+    distances.
+    """
+    offsets = []
+    lengths = []
+    for i in range(-max_cheat_length, max_cheat_length + 1):
+        max_j = max_cheat_length - abs(i)
+        for j in range(-max_j, max_j + 1):
+            if i != 0 or j != 0:
+                offsets.append(i * width + j)
+                lengths.append(abs(i) + abs(j))
+
+    return np.array(offsets), np.array(lengths)
+
+
 def find_shortest_cheat_paths_if_a_cheat_could_only_go_through_walls(
-        position: tuple[int, int],
-        grid: np.array,
-        visited_positions_on_course: set[tuple[int, int]],
+        start_node: int,
+        course_cells: list[int],
+        width: int,
+        visited_nodes_on_course: set[int],
         max_cheat_length: int,
-) -> dict[tuple[int, int], int]:
+) -> dict[int, int]:
+    """
+    course_cells is the course grid padded with OUTSIDE cells and flattened (see
+    grid.pad_grid). Cheats may only move on through walls, so the search doesn't
+    expand track cells except for the starting position.
+    """
+    offsets = get_neighbor_offsets(width)
+
+    def get_neighbors(node: int) -> list[int]:
+        if course_cells[node] != WALL and node != start_node:
+            return []
+        return [node + offset for offset in offsets if course_cells[node + offset] != OUTSIDE]
+
     cheat_endpoints = {}
-    i_max, j_max = grid.shape
-    unvisited_nodes = PriorityQueue()
-    # Item structure of unvisited_nodes:
-    # Tuple(distance, Tuple(<node coordinates on the grid>))
-    unvisited_nodes.put((0, position))
-    visited_nodes = {}
-
-    while unvisited_nodes.queue:
-        current_distance, current_coords = unvisited_nodes.get()
-        if visited_nodes.get(current_coords) is not None:
-            # Node has already been visited
-            continue
-        if current_distance >= max_cheat_length:
-            break
-        neighbors = [
-            (current_coords[0] + 1, current_coords[1]),
-            (current_coords[0] - 1, current_coords[1]),
-            (current_coords[0], current_coords[1] + 1),
-            (current_coords[0], current_coords[1] - 1)
-        ]
-        for next_coords in neighbors:
-            if 0 <= next_coords[0] < i_max and 0 <= next_coords[1] < j_max:
-                next_distance = current_distance + 1
-                if grid[next_coords]:
-                    if visited_nodes.get(next_coords) is None:
-                        # Node hasn't already been visited
-                        unvisited_nodes.put((next_distance, next_coords))
-                elif (
-                        next_coords not in visited_positions_on_course and
-                        next_distance > 1 and
-                        next_coords not in cheat_endpoints.keys()
-                ):
-                    # "Cheats" of length 1 are not going through any walls,
-                    # but just following the course. In addition, we just register
-                    # the first encounter of an endpoint and ignore later ones,
-                    # because the first encounter corresponds to the shortest path
-                    cheat_endpoints[next_coords] = next_distance
-
-        visited_nodes[current_coords] = current_distance
+    for node, distance in local_bfs(start_node, get_neighbors, max_cheat_length).items():
+        # "Cheats" of length 1 are not going through any walls, but just following the
+        # course. Since the search is breadth-first, the distance of each endpoint
+        # corresponds to the shortest path
+        if course_cells[node] == TRACK and distance > 1 and node not in visited_nodes_on_course:
+            cheat_endpoints[node] = distance
 
     return cheat_endpoints
 
@@ -124,15 +108,18 @@ def pass_course_and_find_number_of_good_enough_cheats_if_a_cheat_could_only_go_t
     this function here which should be correct if cheat paths were confined to
     walls only.
     """
-    position = start_coords
+    course_cells, width = pad_grid(course_grid.astype(np.int8), OUTSIDE)
+    offsets = get_neighbor_offsets(width)
+    node = to_node(start_coords, width)
+    end_node = to_node(end_coords, width)
     visited = set()
     cheat_step_counter = {}
     saved_steps = []
     while True:
-        visited.add(position)
+        visited.add(node)
 
         # Collect saved steps for cheats that led to the current position
-        current_cheat_steps = cheat_step_counter.pop(position, None)
+        current_cheat_steps = cheat_step_counter.pop(node, None)
         if current_cheat_steps is not None:
             # The number of saved steps for a cheat is the number of steps on the
             # original path between the cheat's start and end point, minus two
@@ -142,7 +129,7 @@ def pass_course_and_find_number_of_good_enough_cheats_if_a_cheat_could_only_go_t
 
         # Find new cheats that start from the current position
         for endpoint, cheat_steps in find_shortest_cheat_paths_if_a_cheat_could_only_go_through_walls(
-                position, course_grid, visited, max_cheat_length
+                node, course_cells, width, visited, max_cheat_length
         ).items():
             if endpoint in cheat_step_counter:
                 cheat_step_counter[endpoint].append(-cheat_steps)
@@ -151,9 +138,9 @@ def pass_course_and_find_number_of_good_enough_cheats_if_a_cheat_could_only_go_t
 
         # Advance on the course and increase step counter for each "active" cheat
         # (i.e., the ones with visited starting point, but not yet visited end point)
-        if position == end_coords:
+        if node == end_node:
             break
-        position = take_step(position, course_grid, visited)
+        node = take_step(node, course_cells, offsets, visited)
         for cheat_steps in cheat_step_counter.values():
             for i, cheat_path_length in enumerate(cheat_steps):
                 cheat_steps[i] += 1
@@ -168,33 +155,37 @@ def pass_course_and_find_number_of_good_enough_cheats(
         max_cheat_length: int,
         min_cheat_savings: int = 100,
 ) -> int:
-    num_steps_to_position = {}
-    position = start_coords
-    saved_steps = []
-    step_counter = 0
-    while True:
-        for i in range(-max_cheat_length, max_cheat_length + 1):
-            for j in range(-max_cheat_length, max_cheat_length + 1):
-                if i != 0 or j!= 0:
-                    test_position = (position[0] + i, position[1] + j)
-                    steps_on_path = num_steps_to_position.get(test_position)
-                    if steps_on_path is not None:
-                        shortest_path_to_test_position = abs(i) + abs(j)
-                        if (
-                                # We still need to filter here if the shortest path is indeed shorter than
-                                # max_cheat_length, because our heuristic rectangular search region includes
-                                # positions that can't be reached in max_cheat_length steps
-                                shortest_path_to_test_position <= max_cheat_length and
-                                shortest_path_to_test_position < step_counter - steps_on_path
-                        ):
-                            saved_steps.append(step_counter - steps_on_path - shortest_path_to_test_position)
-        num_steps_to_position[position] = step_counter
-        if position == end_coords:
-            break
-        position = take_step(position, course_grid, num_steps_to_position)
-        step_counter += 1
-
-    return len([item for item in saved_steps if item >= min_cheat_savings])
+    """
+    Walk the course once to number its cells, then look up all cells within cheat
+    distance of each cell on the course at once. The grid is padded with a border of
+    max_cheat_length cells, so that no cheat offset wraps around into another row.
+    """
+    course_cells, width = pad_grid(course_grid.astype(np.int8), OUTSIDE, max_cheat_length)
+    offsets = get_neighbor_offsets(width)
+    cheat_offsets, cheat_lengths = get_cheat_offsets(width, max_cheat_length)
+
+    node = to_node(start_coords, width, max_cheat_length)
+    end_node = to_node(end_coords, width, max_cheat_length)
+    path = [node]
+    visited = {node}
+    while node != end_node:
+        node = take_step(node, course_cells, offsets, visited)
+        path.append(node)
+        visited.add(node)
+
+    num_steps_to_node = np.full(len(course_cells), -1)
+    num_steps_to_node[path] = np.arange(len(path))
+    num_good_cheats = 0
+    for step_counter, node in enumerate(path):
+        # Each cheat is counted at its endpoint, i.e. from the later of the two cells on
+        # the course. Cells that are off the course or come later have no savings
+        steps_on_path = num_steps_to_node[node + cheat_offsets]
+        saved_steps = step_counter - steps_on_path - cheat_lengths
+        num_good_cheats += np.count_nonzero(
+            (steps_on_path >= 0) & (saved_steps > 0) & (saved_steps >= min_cheat_savings)
+        )
+
+    return int(num_good_cheats)
 
 
 if __name__ == "__main__":
@@ -1,8 +1,9 @@
-import functools
 import time
 
 import numpy as np
 
+from memo import memoize
+
 EXAMPLE1 = """
 029A
 980A
@@ -67,7 +68,11 @@ def navigate_on_keypad_and_press_button(from_button: str, to_button: str) -> lis
     return navigation_sequence
 
 
-@functools.cache
+# The number of button presses only depends on how many arrowpads are left, so the
+# results can be reused between calls with different max_depth
+@memoize("day21_arrowpads", max_size=10_000, key=lambda from_button, to_button, depth, max_depth: (
+    from_button, to_button, max_depth - depth
+))
 def navigate_on_arrowpads_and_press_button(
         from_button: str,
         to_button: str,
@@ -1,8 +1,11 @@
 import time
 from collections import Counter
+from typing import Iterable
 
 import numpy as np
 
+from line_reader import iter_lines, read_lines
+
 EXAMPLE1 = """
 1
 10
@@ -11,9 +14,9 @@ EXAMPLE1 = """
 """
 
 
-def parse_input(text: str) -> list[int]:
+def parse_input(text: str | Iterable[str]) -> list[int]:
     secrets = []
-    for line in text.strip().split("\n"):
+    for line in iter_lines(text):
         secrets.append(int(line.strip()))
 
     return secrets
@@ -89,10 +92,7 @@ def get_max_num_bananas_by_finding_the_best_diff_sequence(
 
 
 if __name__ == "__main__":
-    with open("../inputs/22.txt", "r") as fh:
-        in_text = fh.read()
-
-    secret_inputs = parse_input(in_text)
+    secret_inputs = parse_input(read_lines("../inputs/22.txt"))
 
     # PART 1
     start = time.perf_counter()
@@ -1,6 +1,9 @@
 import itertools
 import time
-from typing import Callable
+from typing import Callable, Iterable
+
+import metrics
+from line_reader import iter_lines, read_lines
 
 EXAMPLE1 = """
 kh-tc
@@ -38,9 +41,9 @@ td-yn
 """
 
 
-def parse_input(text: str) -> dict[str, set[str]]:
+def parse_input(text: str | Iterable[str]) -> dict[str, set[str]]:
     graph = {}
-    for line in text.strip().split("\n"):
+    for line in iter_lines(text):
         left, right = line.strip().split("-")
         if left in graph:
             graph[left].add(right)
@@ -62,6 +65,8 @@ def dfs_recursion(
         recursion_level: int,
         max_recursion_level: int,
 ) -> list[list[str]]:
+    if metrics.ENABLED:
+        metrics.increment("day23.dfs_recursion_calls")
     cycle_chains = []
     if recursion_level < max_recursion_level:
         for neighbor in graph[node]:
@@ -133,10 +138,7 @@ def get_largest_fully_connected_cluster(graph: dict[str, set[str]]) -> str:
 
 
 if __name__ == "__main__":
-    with open("../inputs/23.txt", "r") as fh:
-        in_text = fh.read()
-
-    network_graph = parse_input(in_text)
+    network_graph = parse_input(read_lines("../inputs/23.txt"))
 
     # PART 1
     start = time.perf_counter()
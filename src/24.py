@@ -1,6 +1,8 @@
 import time
 
-import graphviz
+from lazy_import import lazy_import
+
+graphviz = lazy_import("graphviz")
 
 EXAMPLE1 = """
 x00: 1
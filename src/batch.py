@@ -0,0 +1,76 @@
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Iterator
+
+from days import DAY_PARTS, load_day
+from runner import solve_input
+
+
+def find_input_files(pattern: str) -> list[Path]:
+    """
+    All .txt files in the directory if pattern is a directory, else all files
+    matching the glob pattern.
+    """
+    path = Path(pattern)
+    if path.is_dir():
+        return sorted(path.glob("*.txt"))
+
+    return sorted(Path(p) for p in glob.glob(pattern, recursive=True) if Path(p).is_file())
+
+
+def solve_inputs(
+        day: int,
+        input_files: list[Path],
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+) -> Iterator[dict]:
+    """
+    Solve the day for all input files in a process pool and yield the reports in the
+    order in which they finish. Every worker imports the day module once on startup
+    and reuses it for all files it gets. At most max_pending files are submitted at a
+    time, so that memory stays bounded for arbitrarily many input files.
+    """
+    max_workers = max_workers or os.cpu_count()
+    max_pending = max_pending or 2 * max_workers
+    files = iter(input_files)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=load_day, initargs=(day,)) as executor:
+        pending: set[Future] = set()
+        while True:
+            for input_file in files:
+                pending.add(executor.submit(solve_input, day, input_file))
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve a day for many input files concurrently.")
+    parser.add_argument("day", type=int, help="day to solve")
+    parser.add_argument("inputs", help="directory of .txt input files or glob pattern")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    args = parser.parse_args()
+
+    if args.day not in DAY_PARTS:
+        parser.error(f"Unknown day: {args.day}")
+    input_files = find_input_files(args.inputs)
+    if not input_files:
+        parser.error(f"No input files found for {args.inputs!r}")
+
+    # One JSON object per line, written as soon as the file is solved
+    for report in solve_inputs(args.day, input_files, args.workers):
+        print(json.dumps(report, default=str), flush=True)
+        if report["error"] is not None:
+            print(f"{report['input']}: {report['error']}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
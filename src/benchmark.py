@@ -0,0 +1,168 @@
+import argparse
+import contextlib
+import copy
+import io
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+from days import ALL_DAYS, INPUTS_DIR, SRC_DIR, get_solvers, load_day, read_input
+
+BASELINE_PATH = SRC_DIR.parent / "benchmarks" / "baseline.json"
+
+
+def time_function(
+        function: Callable[[Any], Any],
+        make_argument: Callable[[], Any],
+        warmup: int,
+        repeat: int,
+) -> dict[str, float]:
+    """
+    Call function `warmup` times without measuring and afterward `repeat` times with
+    measuring. Each call gets a fresh argument from make_argument, because some part
+    functions modify their input in place. Creating the argument is not measured.
+    """
+    for _ in range(warmup):
+        function(make_argument())
+
+    timings = []
+    for _ in range(repeat):
+        argument = make_argument()
+        start = time.perf_counter()
+        function(argument)
+        end = time.perf_counter()
+        timings.append((end - start) * 1000)
+
+    if len(timings) >= 2:
+        q1, _, q3 = statistics.quantiles(timings, n=4, method="inclusive")
+    else:
+        q1 = q3 = timings[0]
+
+    return {
+        "median_ms": statistics.median(timings),
+        "iqr_ms": q3 - q1,
+        "min_ms": min(timings),
+        "max_ms": max(timings),
+        "repeat": repeat,
+    }
+
+
+def benchmark_day(day: int, inputs_dir: Path = INPUTS_DIR, warmup: int = 1, repeat: int = 5) -> dict[str, dict]:
+    module = load_day(day)
+    in_text = read_input(day, inputs_dir)
+    parsed = module.parse_input(in_text)
+
+    results = {"parse": time_function(module.parse_input, lambda: in_text, warmup, repeat)}
+    for name, solver in get_solvers(day).items():
+        results[name] = time_function(
+            lambda d: solver(module, d), lambda: copy.deepcopy(parsed), warmup, repeat
+        )
+
+    return results
+
+
+def get_baseline_stats(day_baseline: dict[str, dict], name: str) -> dict | None:
+    """
+    Baseline statistics of a measured function. Days whose parts were later fused into
+    a single solver have baselines of the individual parts, whose medians add up to the
+    baseline of the fused solver.
+    """
+    stats = day_baseline.get(name)
+    if stats is None and name == "solve":
+        part_stats = [stats for key, stats in day_baseline.items() if key.startswith("part_")]
+        if part_stats:
+            return {"median_ms": sum(stats["median_ms"] for stats in part_stats)}
+
+    return stats
+
+
+def find_regressions(
+        results: dict[str, dict[str, dict]],
+        baseline: dict[str, dict[str, dict]],
+        tolerance: float,
+) -> list[tuple[str, str, float, float]]:
+    """
+    Compare the median timings of all measured functions to the baseline. A function
+    has regressed if its median exceeds the baseline median by more than the relative
+    tolerance. Functions that are missing in the baseline are ignored.
+    """
+    regressions = []
+    for day, day_results in results.items():
+        for name, stats in day_results.items():
+            baseline_stats = get_baseline_stats(baseline.get(day, {}), name)
+            if baseline_stats is None:
+                continue
+            if stats["median_ms"] > baseline_stats["median_ms"] * (1 + tolerance):
+                regressions.append((day, name, baseline_stats["median_ms"], stats["median_ms"]))
+
+    return regressions
+
+
+def find_stale_baseline_entries(
+        results: dict[str, dict[str, dict]],
+        baseline: dict[str, dict[str, dict]],
+) -> list[tuple[str, str]]:
+    """
+    Functions of the benchmarked days that have a baseline but weren't measured (and
+    aren't covered by a fused solver), e.g. because they were renamed. Their
+    regressions would go unnoticed.
+    """
+    stale_entries = []
+    for day, day_results in results.items():
+        for name in baseline.get(day, {}):
+            if name in day_results or (name.startswith("part_") and "solve" in day_results):
+                continue
+            stale_entries.append((day, name))
+
+    return stale_entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parse and part functions of all days.")
+    parser.add_argument("days", nargs="*", type=int, default=ALL_DAYS, help="days to benchmark (default: all)")
+    parser.add_argument("--inputs-dir", type=Path, default=INPUTS_DIR, help="directory containing NN.txt inputs")
+    parser.add_argument("--warmup", type=int, default=1, help="number of unmeasured calls per function")
+    parser.add_argument("--repeat", type=int, default=5, help="number of measured calls per function")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--save", action="store_true", help="write the results to the baseline file")
+    parser.add_argument(
+        "--tolerance", type=float, default=0.1, help="relative slowdown above which a function is flagged"
+    )
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+
+    results = {}
+    for day in args.days:
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            day_results = benchmark_day(day, args.inputs_dir, args.warmup, args.repeat)
+        results[f"{day:02d}"] = day_results
+        for name, stats in day_results.items():
+            print(f"Day {day:02d} {name}: median {stats['median_ms']:.2f} ms, IQR {stats['iqr_ms']:.2f} ms.")
+
+    baseline = {}
+    if args.baseline.exists():
+        with open(args.baseline, "r") as fh:
+            baseline = json.load(fh)
+    for day, name in find_stale_baseline_entries(results, baseline):
+        print(f"WARNING Day {day} {name}: in the baseline, but no longer measured.")
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for day, name, baseline_ms, current_ms in regressions:
+        print(f"REGRESSION Day {day} {name}: {baseline_ms:.2f} ms -> {current_ms:.2f} ms.")
+
+    if args.save:
+        # Days that were not benchmarked in this run keep their old baseline
+        baseline.update(results)
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        with open(args.baseline, "w") as fh:
+            json.dump(baseline, fh, indent=2)
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
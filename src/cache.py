@@ -0,0 +1,193 @@
+"""
+Content-addressed on-disk cache for parsed inputs and answers. Entries are keyed by a
+hash of the input text and of the source code the result depends on (the day module
+and the local modules it uses), so editing either one automatically leads to a miss.
+"""
+import hashlib
+import inspect
+import os
+import pickle
+import sys
+from pathlib import Path
+from types import CodeType, ModuleType
+from typing import Any, Callable
+
+import numpy as np
+
+from days import SRC_DIR
+
+CACHE_DIR = SRC_DIR.parent / ".cache"
+
+
+def get_local_source_file(value: Any) -> Path | None:
+    """
+    Source file of the module (or the module defining the function, class, ...),
+    if it is a module from the src directory.
+    """
+    if isinstance(value, ModuleType):
+        module = value
+    else:
+        module = sys.modules.get(getattr(value, "__module__", None) or "")
+    file = getattr(module, "__file__", None)
+    if file is not None and Path(file).resolve().parent == SRC_DIR:
+        return Path(file).resolve()
+
+    return None
+
+
+def get_local_dependencies(module: ModuleType) -> list[Path]:
+    """
+    Source files of the module itself and of all modules from the src directory
+    that are referenced in its namespace (e.g. grid or shortest_path).
+    """
+    files = {Path(module.__file__).resolve()}
+    for value in vars(module).values():
+        file = get_local_source_file(value)
+        if file is not None:
+            files.add(file)
+
+    return sorted(files)
+
+
+def get_source_hash(module: ModuleType, extra_files: tuple[Path, ...] = ()) -> str:
+    source_hash = hashlib.sha256()
+    for file in sorted(set(get_local_dependencies(module)) | set(extra_files)):
+        source_hash.update(file.name.encode())
+        source_hash.update(file.read_bytes())
+
+    return source_hash.hexdigest()
+
+
+def get_global_names(code: CodeType) -> list[str]:
+    """
+    Names of globals (and attributes) used by the code, including the ones used by
+    nested functions, lambdas and comprehensions, which have code objects of their own
+    among the constants.
+    """
+    names = dict.fromkeys(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            names.update(dict.fromkeys(get_global_names(const)))
+
+    return list(names)
+
+
+def get_function_source_hash(function: Callable) -> str:
+    """
+    Hash of the source code of the function, of all functions of the same module it
+    (transitively) calls, of the values of module-level constants it uses and of the
+    other local modules it uses. Unlike get_source_hash, this doesn't change if
+    unrelated code in the same module changes, e.g. the part functions of a day
+    when only parse_input is of interest.
+    """
+    source_hash = hashlib.sha256()
+    visited = set()
+    stack = [function]
+    while stack:
+        current_function = stack.pop(-1)
+        if current_function in visited:
+            continue
+        visited.add(current_function)
+        source_hash.update(inspect.getsource(current_function).encode())
+        for name in get_global_names(current_function.__code__):
+            if name not in current_function.__globals__:
+                continue
+            value = current_function.__globals__[name]
+            if inspect.isfunction(value) and value.__module__ == current_function.__module__:
+                stack.append(value)
+            elif isinstance(value, (int, float, str, bytes, tuple)):
+                source_hash.update(f"{name}={value!r}".encode())
+            else:
+                file = get_local_source_file(value)
+                if file is not None and file.stem != current_function.__module__:
+                    source_hash.update(file.read_bytes())
+
+    return source_hash.hexdigest()
+
+
+def get_cache_key(in_text: str, source_hash: str, name: str) -> str:
+    return hashlib.sha256(f"{name}\0{source_hash}\0".encode() + in_text.encode()).hexdigest()
+
+
+class ResultCache:
+    """
+    Each entry is a single file named <day>_<name>_<key>.<npy|pkl> in the cache directory.
+    NumPy arrays are stored as .npy, everything else is pickled. Reading an entry updates
+    its modification time, so that the least recently used entries are evicted first once
+    the total size of the cache exceeds max_bytes.
+    """
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = 512 * 1024 ** 2):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+
+    def _find_entry(self, day: int, name: str, key: str) -> Path | None:
+        for suffix in (".npy", ".pkl"):
+            path = self.cache_dir / f"{day:02d}_{name}_{key}{suffix}"
+            if path.exists():
+                return path
+
+        return None
+
+    def get(self, day: int, name: str, key: str) -> tuple[bool, Any]:
+        path = self._find_entry(day, name, key)
+        if path is None:
+            return False, None
+        try:
+            if path.suffix == ".npy":
+                value = np.load(path, allow_pickle=False)
+            else:
+                with open(path, "rb") as fh:
+                    value = pickle.load(fh)
+        except (OSError, EOFError, ValueError, pickle.UnpicklingError):
+            # Broken entry, e.g. because a concurrent writer was interrupted
+            path.unlink(missing_ok=True)
+            return False, None
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+
+        return True, value
+
+    def put(self, day: int, name: str, key: str, value: Any):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        is_array = isinstance(value, np.ndarray) and value.dtype != object
+        path = self.cache_dir / f"{day:02d}_{name}_{key}{'.npy' if is_array else '.pkl'}"
+        # Write to a temporary file first, so that readers never see half-written entries
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, "wb") as fh:
+            if is_array:
+                np.save(fh, value, allow_pickle=False)
+            else:
+                pickle.dump(value, fh)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        entries = []
+        for path in self.cache_dir.iterdir():
+            if path.suffix in (".npy", ".pkl"):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    # Removed by another process in the meantime
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+        entries.sort()
+        total_bytes = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total_bytes <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_bytes -= size
+
+    def invalidate(self, day: int | None = None):
+        """
+        Remove all entries of the given day, or the whole cache if no day is given.
+        """
+        if not self.cache_dir.exists():
+            return
+        pattern = "*" if day is None else f"{day:02d}_*"
+        for path in self.cache_dir.glob(pattern):
+            path.unlink(missing_ok=True)
@@ -0,0 +1,198 @@
+"""
+Long-running solver daemon. All day modules (including their lazily imported heavy
+dependencies) are imported once when the daemon starts, so that solve requests only
+pay for parsing and solving. Requests and responses are single lines of JSON sent over
+a Unix domain socket:
+
+    {"command": "solve", "day": 1, "part": 2, "input_path": "..."}  (or "text": "...")
+    {"command": "stats"}
+    {"command": "shutdown"}
+
+Run "python daemon.py serve" to start the daemon and "python daemon.py solve 1" etc.
+to talk to it.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import socket
+import socketserver
+import statistics
+import sys
+import time
+from pathlib import Path
+
+from days import ALL_DAYS, DAY_PARTS, FUSED_SOLVERS, INPUTS_DIR, SRC_DIR, get_input_path, load_day
+from implementations import get_part_solver
+from lazy_import import load_lazy_modules
+
+SOCKET_PATH = SRC_DIR.parent / ".solver.sock"
+
+
+class SolverServer(socketserver.UnixStreamServer):
+    """
+    Requests are handled one after another, so that the stdout/stderr redirection
+    around the solvers and the timings are not affected by concurrent solves.
+    """
+
+    def __init__(self, socket_path: Path, days: list[int]):
+        self.modules = {}
+        self.import_ms = {}
+        for day in days:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                module = load_day(day)
+                load_lazy_modules(module)
+            self.import_ms[day] = (time.perf_counter() - start) * 1000
+            self.modules[day] = module
+        # Latencies in ms of all solve requests, keyed by "<day>" or "<day>.<part>"
+        self.latencies: dict[str, list[float]] = {}
+        self.shutdown_requested = False
+
+        socket_path = Path(socket_path)
+        if socket_path.exists():
+            socket_path.unlink()
+        super().__init__(str(socket_path), SolverRequestHandler)
+
+    def solve(self, request: dict) -> dict:
+        day = request["day"]
+        part = request.get("part")
+        if day not in self.modules:
+            raise ValueError(f"Day {day} is not loaded.")
+        if part is not None and not 1 <= part <= len(DAY_PARTS[day]):
+            raise ValueError(f"Day {day} has no part {part}.")
+
+        module = self.modules[day]
+        start = time.perf_counter()
+        if "text" in request:
+            in_text = request["text"]
+        else:
+            with open(request.get("input_path") or get_input_path(day, INPUTS_DIR), "r") as fh:
+                in_text = fh.read()
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            parsed = module.parse_input(in_text)
+            parse_end = time.perf_counter()
+            if part is not None:
+                answers = [get_part_solver(day, part)(module, parsed)]
+            elif day in FUSED_SOLVERS:
+                answers = list(FUSED_SOLVERS[day](module, parsed))
+            else:
+                answers = [get_part_solver(day, i + 1)(module, parsed) for i in range(len(DAY_PARTS[day]))]
+        end = time.perf_counter()
+
+        latency_ms = (end - start) * 1000
+        key = str(day) if part is None else f"{day}.{part}"
+        self.latencies.setdefault(key, []).append(latency_ms)
+
+        return {
+            "answers": answers,
+            "parse_ms": (parse_end - start) * 1000,
+            "latency_ms": latency_ms,
+            "p50_ms": statistics.median(self.latencies[key]),
+        }
+
+    def get_stats(self) -> dict:
+        return {
+            "import_ms": self.import_ms,
+            "latencies": {
+                key: {"count": len(latencies), "p50_ms": statistics.median(latencies), "min_ms": min(latencies)}
+                for key, latencies in sorted(self.latencies.items())
+            },
+        }
+
+
+class SolverRequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # A client may send several requests over the same connection
+        for line in self.rfile:
+            try:
+                request = json.loads(line)
+                command = request.get("command", "solve")
+                if command == "solve":
+                    response = self.server.solve(request)
+                elif command == "stats":
+                    response = self.server.get_stats()
+                elif command == "shutdown":
+                    response = {}
+                    # The serving loop stops after this request has been answered
+                    self.server.shutdown_requested = True
+                else:
+                    raise ValueError(f"Unknown command: {command}")
+                response["error"] = None
+            except Exception as e:
+                response = {"error": f"{type(e).__name__}: {e}"}
+            # Results of the parts may be NumPy scalars, which json can't serialize
+            self.wfile.write(json.dumps(response, default=str).encode() + b"\n")
+            self.wfile.flush()
+
+
+def serve(socket_path: Path = SOCKET_PATH, days: list[int] = ALL_DAYS):
+    with SolverServer(socket_path, days) as server:
+        total_import_ms = sum(server.import_ms.values())
+        print(f"Loaded {len(days)} days in {total_import_ms:.2f} ms. Listening on {socket_path}.", flush=True)
+        try:
+            while not server.shutdown_requested:
+                server.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            Path(socket_path).unlink(missing_ok=True)
+
+
+def send_request(request: dict, socket_path: Path = SOCKET_PATH) -> dict:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        with sock.makefile("rwb") as fh:
+            fh.write(json.dumps(request).encode() + b"\n")
+            fh.flush()
+            return json.loads(fh.readline())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm solver daemon and its client.")
+    parser.add_argument("--socket", type=Path, default=SOCKET_PATH, help="path of the Unix domain socket")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = subparsers.add_parser("serve", help="start the daemon")
+    serve_parser.add_argument("days", nargs="*", type=int, default=ALL_DAYS, help="days to preload (default: all)")
+
+    solve_parser = subparsers.add_parser("solve", help="solve a day using the daemon")
+    solve_parser.add_argument("day", type=int, help="day to solve")
+    solve_parser.add_argument("--part", type=int, help="part to solve (default: all)")
+    input_group = solve_parser.add_mutually_exclusive_group()
+    input_group.add_argument("--input", type=Path, help="input file (default: inputs/NN.txt)")
+    input_group.add_argument("--stdin", action="store_true", help="read the input text from stdin")
+
+    subparsers.add_parser("stats", help="show the latencies of the daemon")
+    subparsers.add_parser("shutdown", help="stop the daemon")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.socket, args.days)
+        return
+
+    request = {"command": args.command}
+    if args.command == "solve":
+        request.update(day=args.day, part=args.part)
+        if args.stdin:
+            request["text"] = sys.stdin.read()
+        elif args.input is not None:
+            # The daemon may run in a different working directory
+            request["input_path"] = os.path.abspath(args.input)
+    response = send_request(request, args.socket)
+    if response["error"] is not None:
+        sys.exit(f"Error: {response['error']}")
+
+    if args.command == "solve":
+        first_part = args.part or 1
+        for i, answer in enumerate(response["answers"]):
+            print(f"Day {args.day:02d} Part {first_part + i} Result: {answer}.")
+        print(f"Took {response['latency_ms']:.2f} ms (p50 {response['p50_ms']:.2f} ms).")
+    elif args.command == "stats":
+        for key, stats in response["latencies"].items():
+            print(f"{key}: {stats['count']} solves, p50 {stats['p50_ms']:.2f} ms, min {stats['min_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
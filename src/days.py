@@ -0,0 +1,165 @@
+import importlib
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+SRC_DIR = Path(__file__).resolve().parent
+INPUTS_DIR = SRC_DIR.parent / "inputs"
+
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+# Each entry maps a day to its part functions. A part function receives the imported
+# day module and the output of its parse_input and returns the part's answer. The
+# arguments are the same ones used in the __main__ block of the respective day.
+DAY_PARTS: dict[int, tuple[Callable[[ModuleType, Any], Any], ...]] = {
+    1: (
+        lambda m, d: m.get_total_distance(m.get_distances(*d)),
+        lambda m, d: m.get_similarity_score(*d),
+    ),
+    2: (
+        lambda m, d: m.find_safe_reports(*d),
+        lambda m, d: m.find_safe_reports_including_problem_dampener_linear(*d),
+    ),
+    3: (
+        lambda m, d: m.add_multiplications(m.find_valid_statements(d)),
+        lambda m, d: sum(
+            m.add_multiplications(m.find_valid_statements(section)) for section in m.find_active_sections(d)
+        ),
+    ),
+    4: (
+        lambda m, d: m.find_num_words(d, m.get_num_valid_words_from_starting_point),
+        lambda m, d: m.find_num_words(d, m.is_valid_xmas_cross),
+    ),
+    5: (
+        lambda m, d: m.find_valid_updates(*d),
+        lambda m, d: m.sum_middle_numbers_of_reordered_updates(*d),
+    ),
+    6: (
+        lambda m, d: m.count_steps(d)[0],
+        lambda m, d: m.find_num_cycles(d, m.count_steps(d)[1]),
+    ),
+    7: (
+        lambda m, d: m.sum_valid_equations(d, m.check_validity_part_1),
+        lambda m, d: m.sum_valid_equations(d, m.check_validity_part_2),
+    ),
+    8: (
+        lambda m, d: m.get_num_unique_antinode_positions(*d, m.find_antinodes_part_1),
+        lambda m, d: m.get_num_unique_antinode_positions(*d, m.find_antinodes_part_2),
+    ),
+    9: (
+        lambda m, d: m.get_checksum(m.defragment_disk_part_1(d)),
+        lambda m, d: m.get_checksum(m.defragment_disk_part_2(d)),
+    ),
+    10: (
+        lambda m, d: m.find_overall_num_paths(d, True),
+        lambda m, d: m.find_overall_num_paths(d, False),
+    ),
+    11: (
+        lambda m, d: m.blink_n_times_and_get_number_of_stones_total(d, 25),
+        lambda m, d: m.blink_n_times_and_get_number_of_stones_total(d, 75),
+    ),
+    12: (
+        lambda m, d: m.calculate_overall_fencing_cost(d, False),
+        lambda m, d: m.calculate_overall_fencing_cost(d, True),
+    ),
+    13: (
+        lambda m, d: m.get_total_game_costs(d),
+        lambda m, d: m.get_total_game_costs(m.correct_unit_conversion(d)),
+    ),
+    14: (
+        lambda m, d: m.simulate_robots_and_calculate_safety_factor(d, (101, 103), 100),
+        lambda m, d: m.simulate_robots_and_find_num_steps_to_form_christmas_tree(d, (101, 103), 10000),
+    ),
+    15: (
+        lambda m, d: m.sum_gps_coordinates_after_robot_moving(*d, m.push_boxes_part_1, "O"),
+        lambda m, d: m.sum_gps_coordinates_after_robot_moving(
+            m.create_wider_warehouse(d[0]), d[1], m.push_boxes_part_2, "["
+        ),
+    ),
+    16: (
+        lambda m, d: m.find_all_shortest_paths_dijkstra(*d)[0],
+        lambda m, d: m.find_all_shortest_paths_dijkstra(*d)[1],
+    ),
+    17: (
+        lambda m, d: ",".join(str(i) for i in m.Program(*d).run()),
+        lambda m, d: m.find_correct_register_a_value(*d),
+    ),
+    18: (
+        lambda m, d: m.find_shortest_path((0, 0), (70, 70), d, 71, 1024),
+        lambda m, d: ",".join(str(i) for i in m.find_first_blocking_byte((0, 0), (70, 70), d, 71, 1024)),
+    ),
+    19: (
+        lambda m, d: m.get_num_possible_designs(*d),
+        lambda m, d: m.get_overall_num_possibilities_to_create_designs(*d),
+    ),
+    20: (
+        lambda m, d: m.pass_course_and_find_number_of_good_enough_cheats(*d, max_cheat_length=2),
+        lambda m, d: m.pass_course_and_find_number_of_good_enough_cheats(*d, max_cheat_length=20),
+    ),
+    21: (
+        lambda m, d: m.open_door_and_get_sum_of_complexities(d, 1),
+        lambda m, d: m.open_door_and_get_sum_of_complexities(d, 24),
+    ),
+    22: (
+        lambda m, d: m.sum_secret_numbers_after_iterations(d, 2000),
+        lambda m, d: m.get_max_num_bananas_by_finding_the_best_diff_sequence(
+            m.calculate_4_step_differences(d, 2000)
+        ),
+    ),
+    23: (
+        lambda m, d: m.get_all_cycles(d, 3, m.does_chain_contain_t),
+        lambda m, d: m.get_largest_fully_connected_cluster(d),
+    ),
+    24: (
+        lambda m, d: m.get_output_value(m.evaluate_circuit(*d)),
+        lambda m, d: ",".join(sorted(m.identify_faulty_wirings(d[1]))),
+    ),
+    25: (
+        lambda m, d: m.find_num_possible_combinations(*d),
+    ),
+}
+
+# Days whose parts are computed together by a single function. The fused solver
+# returns a tuple with one result per part and replaces the individual part calls
+FUSED_SOLVERS: dict[int, Callable[[ModuleType, Any], tuple]] = {
+    3: lambda m, d: m.scan_memory(d),
+    16: lambda m, d: m.find_all_shortest_paths_dijkstra(*d),
+}
+
+ALL_DAYS = sorted(DAY_PARTS)
+
+
+def get_solvers(
+        day: int,
+        get_part_solver: Callable[[int, int], Callable[[ModuleType, Any], Any]] | None = None,
+) -> dict[str, Callable[[ModuleType, Any], Any]]:
+    """
+    The functions computing the answers of a day from its parsed input, keyed by
+    "part_1", "part_2", ... or by "solve" for days whose parts are computed together by
+    a fused solver (which returns all answers). Every day's input is parsed once by the
+    parse_input of its module, and the solvers are independent of each other, so they
+    can run in any order or in parallel. get_part_solver(day, part) picks the function
+    of a part, by default the one of DAY_PARTS (implementations.get_part_solver picks
+    the fastest of its alternative implementations).
+    """
+    if day in FUSED_SOLVERS:
+        return {"solve": FUSED_SOLVERS[day]}
+    if get_part_solver is None:
+        return {f"part_{i + 1}": part for i, part in enumerate(DAY_PARTS[day])}
+
+    return {f"part_{i + 1}": get_part_solver(day, i + 1) for i in range(len(DAY_PARTS[day]))}
+
+
+def load_day(day: int) -> ModuleType:
+    return importlib.import_module(f"{day:02d}")
+
+
+def get_input_path(day: int, inputs_dir: Path = INPUTS_DIR) -> Path:
+    return Path(inputs_dir) / f"{day:02d}.txt"
+
+
+def read_input(day: int, inputs_dir: Path = INPUTS_DIR) -> str:
+    with open(get_input_path(day, inputs_dir), "r") as fh:
+        return fh.read()
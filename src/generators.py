@@ -0,0 +1,728 @@
+"""
+Seeded generators for synthetic puzzle inputs. Every generator takes a random.Random
+instance plus size knobs (with defaults close to the size of the official inputs) and
+returns the input text in exactly the format the parse_input function of its day
+expects.
+"""
+import argparse
+import contextlib
+import inspect
+import io
+import itertools
+import random
+import string
+from pathlib import Path
+from typing import Callable
+
+from days import DAY_PARTS, load_day
+
+DIRECTIONS = [(-1, 0), (0, 1), (1, 0), (0, -1)]
+
+
+def format_grid(grid: list[list[str]]) -> str:
+    return "\n".join("".join(row) for row in grid) + "\n"
+
+
+def generate_maze(rng: random.Random, side: int) -> list[list[str]]:
+    """
+    Carve a perfect maze by a randomized depth-first search over the cells with odd
+    coordinates. The outermost rows and columns always stay walls.
+    """
+    if side < 5 or side % 2 == 0:
+        raise ValueError(f"Maze side length must be an odd number >= 5, got {side}.")
+    grid = [["#"] * side for _ in range(side)]
+    start = (side - 2, 1)
+    grid[start[0]][start[1]] = "."
+    stack = [start]
+    while stack:
+        i, j = stack[-1]
+        candidates = []
+        for di, dj in DIRECTIONS:
+            next_i, next_j = i + 2 * di, j + 2 * dj
+            if 0 < next_i < side - 1 and 0 < next_j < side - 1 and grid[next_i][next_j] == "#":
+                candidates.append((next_i, next_j, di, dj))
+        if candidates:
+            next_i, next_j, di, dj = rng.choice(candidates)
+            grid[i + di][j + dj] = "."
+            grid[next_i][next_j] = "."
+            stack.append((next_i, next_j))
+        else:
+            stack.pop(-1)
+
+    return grid
+
+
+def find_maze_path(grid: list[list[str]], start: tuple[int, int], end: tuple[int, int]) -> list[tuple[int, int]]:
+    predecessors = {start: None}
+    queue = [start]
+    for i, j in queue:
+        if (i, j) == end:
+            break
+        for di, dj in DIRECTIONS:
+            next_pos = (i + di, j + dj)
+            if grid[next_pos[0]][next_pos[1]] != "#" and next_pos not in predecessors:
+                predecessors[next_pos] = (i, j)
+                queue.append(next_pos)
+    path = [end]
+    while predecessors[path[-1]] is not None:
+        path.append(predecessors[path[-1]])
+
+    return path[::-1]
+
+
+def generate_day_01(rng: random.Random, num_lines: int = 1000) -> str:
+    lines = [f"{rng.randint(10000, 99999)}   {rng.randint(10000, 99999)}" for _ in range(num_lines)]
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_02(
+        rng: random.Random,
+        num_reports: int = 1000,
+        min_levels: int = 5,
+        max_levels: int = 8,
+        error_probability: float = 0.3,
+) -> str:
+    lines = []
+    for _ in range(num_reports):
+        num_levels = rng.randint(min_levels, max_levels)
+        direction = rng.choice((-1, 1))
+        level = rng.randint(10, 90)
+        report = [level]
+        for _ in range(num_levels - 1):
+            level += direction * rng.randint(1, 3)
+            report.append(level)
+        while rng.random() < error_probability:
+            report[rng.randrange(num_levels)] += rng.randint(-4, 4)
+        lines.append(" ".join(map(str, report)))
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_03(rng: random.Random, num_lines: int = 6, line_length: int = 3000) -> str:
+    tokens = [
+        lambda: f"mul({rng.randint(1, 999)},{rng.randint(1, 999)})",
+        lambda: "do()",
+        lambda: "don't()",
+        lambda: f"mul({rng.randint(1, 999)},{rng.randint(1, 999)}]",
+        lambda: f"mul[{rng.randint(1, 999)},{rng.randint(1, 999)})",
+        lambda: f"mul ( {rng.randint(1, 999)},{rng.randint(1, 999)})",
+        lambda: "".join(rng.choices(string.punctuation + string.ascii_lowercase + " ", k=rng.randint(1, 8))),
+    ]
+    weights = [6, 1, 1, 1, 1, 1, 10]
+    lines = []
+    for _ in range(num_lines):
+        line = ""
+        while len(line) < line_length:
+            line += rng.choices(tokens, weights)[0]()
+        lines.append(line)
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_04(rng: random.Random, side: int = 140) -> str:
+    return format_grid([rng.choices("XMAS", k=side) for _ in range(side)])
+
+
+def generate_day_05(
+        rng: random.Random,
+        num_pages: int = 49,
+        num_updates: int = 200,
+        min_update_length: int = 5,
+        max_update_length: int = 23,
+) -> str:
+    """
+    All pages are brought into a random total order, and there is one rule for each
+    pair of pages. Roughly half of the updates are already correctly ordered.
+    """
+    pages = rng.sample(range(10, 100), num_pages)
+    rules = [f"{pages[i]}|{pages[j]}" for i in range(num_pages) for j in range(i + 1, num_pages)]
+    rng.shuffle(rules)
+    updates = []
+    for _ in range(num_updates):
+        update_length = rng.randrange(min_update_length, min(max_update_length, num_pages) + 1, 2)
+        update = rng.sample(pages, update_length)
+        if rng.random() < 0.5:
+            update.sort(key=pages.index)
+        updates.append(",".join(map(str, update)))
+
+    return "\n".join(rules) + "\n\n" + "\n".join(updates) + "\n"
+
+
+def plan_guard_route(
+        rng: random.Random,
+        side: int,
+        start: tuple[int, int],
+        num_turns: int,
+) -> tuple[set[tuple[int, int]], set[tuple[int, int]]] | None:
+    """
+    Lay out the route of the guard as num_turns straight segments of random length,
+    each ended by an obstacle that makes the guard turn right, followed by a final
+    segment leaving the grid. A segment must neither cross an obstacle nor walk a cell
+    in a direction the guard already walked it in (which would close a loop), and an
+    obstacle must not block a cell the guard already walked. Returns the cells on the
+    route and the obstacles, or None if the route got stuck.
+    """
+    route, obstacles = {start}, set()
+    states = {(start, 0)}
+    (i, j), direction = start, 0
+
+    def is_free(segment: list[tuple[int, int]]) -> bool:
+        return all(cell not in obstacles and (cell, direction) not in states for cell in segment)
+
+    for turn in range(num_turns + 1):
+        di, dj = DIRECTIONS[direction]
+        # Number of steps until the guard leaves the grid
+        max_steps = min(
+            i + 1 if di < 0 else side - i if di > 0 else side,
+            j + 1 if dj < 0 else side - j if dj > 0 else side,
+        )
+        if turn == num_turns:
+            segment = [(i + step * di, j + step * dj) for step in range(1, max_steps)]
+            if not is_free(segment):
+                return None
+            route.update(segment)
+            break
+        # The guard walks num_steps - 1 cells and then faces the obstacle
+        for num_steps in rng.sample(range(1, max_steps), max_steps - 1):
+            segment = [(i + step * di, j + step * dj) for step in range(1, num_steps)]
+            end = segment[-1] if segment else (i, j)
+            obstacle = (end[0] + di, end[1] + dj)
+            turned = (end, (direction + 1) % 4)
+            if is_free(segment) and obstacle not in route and turned not in states:
+                break
+        else:
+            return None
+        route.update(segment)
+        states.update((cell, direction) for cell in segment)
+        obstacles.add(obstacle)
+        states.add(turned)
+        (i, j), direction = turned
+
+    return route, obstacles
+
+
+def generate_day_06(
+        rng: random.Random,
+        side: int = 130,
+        num_turns: int = 120,
+        obstacle_density: float = 0.03,
+) -> str:
+    """
+    The route of the guard is planned first (see plan_guard_route), so that it leaves
+    the grid after thousands of steps and crosses itself often enough for obstacles to
+    cause loops. The other obstacles are scattered off the route, where the guard never
+    runs into them.
+    """
+    while True:
+        start = (rng.randrange(side), rng.randrange(side))
+        planned = plan_guard_route(rng, side, start, num_turns)
+        if planned is not None:
+            break
+    route, obstacles = planned
+    grid = [
+        ["#" if (i, j) in obstacles or (i, j) not in route and rng.random() < obstacle_density else "."
+         for j in range(side)]
+        for i in range(side)
+    ]
+    grid[start[0]][start[1]] = "^"
+
+    return format_grid(grid)
+
+
+def generate_day_07(
+        rng: random.Random,
+        num_equations: int = 850,
+        min_operands: int = 3,
+        max_operands: int = 12,
+        valid_fraction: float = 0.5,
+) -> str:
+    lines = []
+    for _ in range(num_equations):
+        operands = [rng.randint(1, 999) for _ in range(rng.randint(min_operands, max_operands))]
+        if rng.random() < valid_fraction:
+            result = operands[0]
+            for operand in operands[1:]:
+                operation = rng.choice(("+", "*", "||"))
+                if operation == "+":
+                    result += operand
+                elif operation == "*":
+                    result *= operand
+                else:
+                    result = int(f"{result}{operand}")
+        else:
+            result = rng.randint(1, 10 ** rng.randint(3, 15))
+        lines.append(f"{result}: {' '.join(map(str, operands))}")
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_08(
+        rng: random.Random,
+        side: int = 50,
+        num_frequencies: int = 40,
+        antennas_per_frequency: int = 4,
+) -> str:
+    grid = [["."] * side for _ in range(side)]
+    frequencies = rng.sample(string.ascii_letters + string.digits, num_frequencies)
+    free_cells = rng.sample(range(side * side), min(num_frequencies * antennas_per_frequency, side * side))
+    for n, cell in enumerate(free_cells):
+        grid[cell // side][cell % side] = frequencies[n % num_frequencies]
+
+    return format_grid(grid)
+
+
+def generate_day_09(rng: random.Random, disk_map_length: int = 19999) -> str:
+    digits = []
+    for i in range(disk_map_length):
+        digits.append(str(rng.randint(1, 9) if i % 2 == 0 else rng.randint(0, 9)))
+
+    return "".join(digits) + "\n"
+
+
+def generate_day_10(rng: random.Random, side: int = 50, num_trails: int = 200) -> str:
+    """
+    Random heights, overlaid with random hiking trails leading from height 0 to 9.
+    """
+    grid = [[str(rng.randint(0, 9)) for _ in range(side)] for _ in range(side)]
+    for _ in range(num_trails):
+        i, j = rng.randrange(side), rng.randrange(side)
+        grid[i][j] = "0"
+        for height in range(1, 10):
+            di, dj = rng.choice(DIRECTIONS)
+            if 0 <= i + di < side and 0 <= j + dj < side:
+                i, j = i + di, j + dj
+            grid[i][j] = str(height)
+
+    return format_grid(grid)
+
+
+def generate_day_11(rng: random.Random, num_stones: int = 8) -> str:
+    return " ".join(str(rng.randint(0, 10 ** rng.randint(1, 7))) for _ in range(num_stones)) + "\n"
+
+
+def generate_day_12(
+        rng: random.Random,
+        side: int = 140,
+        num_plant_types: int = 26,
+        continuation_probability: float = 0.85,
+) -> str:
+    """
+    Each plot takes over the plant type of its upper or left neighbor with the given
+    probability, which forms irregular regions of varying size.
+    """
+    plant_types = string.ascii_uppercase[:num_plant_types]
+    grid = [[""] * side for _ in range(side)]
+    for i in range(side):
+        for j in range(side):
+            neighbors = []
+            if i > 0:
+                neighbors.append(grid[i - 1][j])
+            if j > 0:
+                neighbors.append(grid[i][j - 1])
+            if neighbors and rng.random() < continuation_probability:
+                grid[i][j] = rng.choice(neighbors)
+            else:
+                grid[i][j] = rng.choice(plant_types)
+
+    return format_grid(grid)
+
+
+# Added to the prize coordinates in part 2 of day 13
+DAY_13_PRIZE_OFFSET = 10000000000000
+
+
+def generate_day_13(
+        rng: random.Random,
+        num_machines: int = 320,
+        solvable_fraction: float = 0.3,
+        offset_solvable_fraction: float = 0.3,
+) -> str:
+    """
+    A solvable fraction of the machines is planted for each part: for part 1 as a small
+    number of button presses, and for part 2 as the presses that reach the prize moved by
+    DAY_13_PRIZE_OFFSET, rounded so that the prize comes out at small coordinates.
+    """
+    blocks = []
+    for _ in range(num_machines):
+        a_x, a_y, b_x, b_y = (rng.randint(10, 99) for _ in range(4))
+        kind = rng.random()
+        if kind < solvable_fraction:
+            n_a, n_b = rng.randint(1, 100), rng.randint(1, 100)
+            t_x, t_y = n_a * a_x + n_b * b_x, n_a * a_y + n_b * b_y
+        elif kind < solvable_fraction + offset_solvable_fraction:
+            while True:
+                determinant = a_x * b_y - a_y * b_x
+                offset_x = DAY_13_PRIZE_OFFSET + rng.randint(1000, 20000)
+                offset_y = DAY_13_PRIZE_OFFSET + rng.randint(1000, 20000)
+                if determinant != 0:
+                    n_a = round((b_y * offset_x - b_x * offset_y) / determinant)
+                    n_b = round((a_x * offset_y - a_y * offset_x) / determinant)
+                    if n_a > 0 and n_b > 0:
+                        break
+                # Only buttons on either side of the diagonal reach the far-off prize
+                a_x, a_y, b_x, b_y = (rng.randint(10, 99) for _ in range(4))
+            t_x = n_a * a_x + n_b * b_x - DAY_13_PRIZE_OFFSET
+            t_y = n_a * a_y + n_b * b_y - DAY_13_PRIZE_OFFSET
+        else:
+            t_x, t_y = rng.randint(1000, 20000), rng.randint(1000, 20000)
+        blocks.append(
+            f"Button A: X+{a_x}, Y+{a_y}\n"
+            f"Button B: X+{b_x}, Y+{b_y}\n"
+            f"Prize: X={t_x}, Y={t_y}"
+        )
+
+    return "\n\n".join(blocks) + "\n"
+
+
+def generate_day_14(rng: random.Random, num_robots: int = 500, width: int = 101, height: int = 103) -> str:
+    lines = []
+    for _ in range(num_robots):
+        lines.append(
+            f"p={rng.randrange(width)},{rng.randrange(height)} "
+            f"v={rng.randint(-width + 2, width - 2)},{rng.randint(-height + 2, height - 2)}"
+        )
+
+    return "\n".join(lines) + "\n"
+
+
+def generate_day_15(
+        rng: random.Random,
+        side: int = 50,
+        box_density: float = 0.4,
+        wall_density: float = 0.05,
+        num_moves: int = 20000,
+        moves_per_line: int = 1000,
+) -> str:
+    grid = [["#"] * side for _ in range(side)]
+    for i in range(1, side - 1):
+        for j in range(1, side - 1):
+            r = rng.random()
+            grid[i][j] = "#" if r < wall_density else "O" if r < wall_density + box_density else "."
+    grid[rng.randint(1, side - 2)][rng.randint(1, side - 2)] = "@"
+    moves = "".join(rng.choices("<>^v", k=num_moves))
+    move_lines = [moves[i:i + moves_per_line] for i in range(0, num_moves, moves_per_line)]
+
+    return format_grid(grid) + "\n" + "\n".join(move_lines) + "\n"
+
+
+def generate_day_16(rng: random.Random, side: int = 141, loop_fraction: float = 0.1) -> str:
+    """
+    A perfect maze with the start in the lower left and the end in the upper right
+    corner. Some additional walls are removed to create multiple possible paths.
+    """
+    grid = generate_maze(rng, side)
+    for i in range(1, side - 1):
+        for j in range(1, side - 1):
+            if grid[i][j] == "#" and (i % 2 == 1) != (j % 2 == 1) and rng.random() < loop_fraction:
+                grid[i][j] = "."
+    grid[side - 2][1] = "S"
+    grid[1][side - 2] = "E"
+
+    return format_grid(grid)
+
+
+def run_day_17_program(a: int, xor_1: int, xor_2: int) -> list[int]:
+    output = []
+    while a != 0:
+        b = (a % 8) ^ xor_1
+        c = a >> b
+        b = b ^ xor_2 ^ c
+        a >>= 3
+        output.append(b % 8)
+
+    return output
+
+
+def find_day_17_quine_register_value(xor_1: int, xor_2: int, instructions: list[int]) -> int | None:
+    candidates = [0]
+    for i in range(len(instructions)):
+        candidates = [
+            a * 8 + n for a in candidates for n in range(8)
+            if run_day_17_program(a * 8 + n, xor_1, xor_2) == instructions[-1 - i:]
+        ]
+
+    return min(candidates, default=None)
+
+
+def generate_day_17(rng: random.Random) -> str:
+    """
+    Programs have the same structure as the official inputs: in each loop iteration,
+    the last three bits of A are scrambled with B and C, one value is output and A is
+    shifted by three bits. Only programs that can reproduce themselves are accepted,
+    so that part 2 has a solution.
+    """
+    while True:
+        xor_1, xor_2 = rng.randrange(8), rng.randrange(8)
+        instructions = [2, 4, 1, xor_1, 7, 5, 1, xor_2, 4, rng.randrange(8), 0, 3, 5, 5, 3, 0]
+        if find_day_17_quine_register_value(xor_1, xor_2, instructions) is not None:
+            break
+    register_a = rng.randrange(8 ** 9, 8 ** 10)
+
+    return (
+        f"Register A: {register_a}\n"
+        f"Register B: 0\n"
+        f"Register C: 0\n"
+        f"\n"
+        f"Program: {','.join(map(str, instructions))}\n"
+    )
+
+
+def is_memory_space_passable(side: int, corrupted: set[tuple[int, int]]) -> bool:
+    reached = {(0, 0)}
+    queue = [(0, 0)]
+    for x, y in queue:
+        for dx, dy in DIRECTIONS:
+            next_pos = (x + dx, y + dy)
+            if (
+                    0 <= next_pos[0] < side and 0 <= next_pos[1] < side and
+                    next_pos not in corrupted and next_pos not in reached
+            ):
+                reached.add(next_pos)
+                queue.append(next_pos)
+
+    return (side - 1, side - 1) in reached
+
+
+def generate_day_18(rng: random.Random, side: int = 71, num_bytes: int = 3450, num_safe_bytes: int = 1024) -> str:
+    """
+    The bytes fall onto every cell except the start and the end cell in random order. The
+    order is drawn anew until there is still a path after the first num_safe_bytes bytes.
+    """
+    cells = [(x, y) for x in range(side) for y in range(side) if (x, y) not in ((0, 0), (side - 1, side - 1))]
+    rng.shuffle(cells)
+    while not is_memory_space_passable(side, set(cells[:num_safe_bytes])):
+        rng.shuffle(cells)
+
+    return "\n".join(f"{x},{y}" for x, y in cells[:num_bytes]) + "\n"
+
+
+def generate_day_19(
+        rng: random.Random,
+        num_towels: int = 447,
+        max_towel_length: int = 8,
+        num_designs: int = 400,
+        min_design_length: int = 20,
+        max_design_length: int = 60,
+        possible_fraction: float = 0.7,
+) -> str:
+    """
+    No towel starts with one of the colours (which leaves out the towel of a single
+    stripe of that colour), so designs starting with it are impossible. The possible
+    designs are made of towels, the impossible ones too but with a stripe of that colour
+    prepended.
+    """
+    missing_colour = rng.choice("wubrg")
+    towels = set()
+    while len(towels) < num_towels:
+        towel = "".join(rng.choices("wubrg", k=rng.randint(1, max_towel_length)))
+        if not towel.startswith(missing_colour):
+            towels.add(towel)
+    towel_list = sorted(towels)
+    num_possible = round(possible_fraction * num_designs)
+    designs = []
+    for index in range(num_designs):
+        design_length = rng.randint(min_design_length, max_design_length)
+        design = ""
+        while len(design) < design_length:
+            design += rng.choice(towel_list)
+        if index >= num_possible:
+            design = missing_colour + design
+        designs.append(design)
+    rng.shuffle(designs)
+
+    return ", ".join(towel_list) + "\n\n" + "\n".join(designs) + "\n"
+
+
+def generate_day_20(rng: random.Random, side: int = 141) -> str:
+    """
+    The race track is the unique path between start and end through a perfect maze,
+    everything else is a wall. Therefore, there is exactly one way through the track.
+    """
+    maze = generate_maze(rng, side)
+    start, end = (side - 2, 1), (rng.randrange(1, side - 1, 2), rng.randrange(1, side - 1, 2))
+    grid = [["#"] * side for _ in range(side)]
+    for i, j in find_maze_path(maze, start, end):
+        grid[i][j] = "."
+    grid[start[0]][start[1]] = "S"
+    grid[end[0]][end[1]] = "E"
+
+    return format_grid(grid)
+
+
+def generate_day_21(rng: random.Random, num_codes: int = 5) -> str:
+    return "\n".join(f"{rng.randint(1, 999):03d}A" for _ in range(num_codes)) + "\n"
+
+
+def generate_day_22(rng: random.Random, num_buyers: int = 2000) -> str:
+    return "\n".join(str(rng.randint(1, 16777215)) for _ in range(num_buyers)) + "\n"
+
+
+def generate_day_23(rng: random.Random, num_nodes: int = 520, degree: int = 13, clique_size: int = 13) -> str:
+    """
+    A random graph in which every node has approximately the given degree, with a
+    planted fully connected cluster. Like in the official inputs, the members of the
+    cluster spend clique_size - 1 of their edges within the cluster. The remaining edges
+    are created by pairing up stubs randomly (self-loops and duplicate edges are dropped).
+    """
+    names = rng.sample(["".join(pair) for pair in itertools.product(string.ascii_lowercase, repeat=2)], num_nodes)
+    clique = rng.sample(names, clique_size)
+    stubs = [name for name in names for _ in range(degree - (clique_size - 1 if name in clique else 0))]
+    rng.shuffle(stubs)
+    edges = set()
+    for left, right in zip(stubs[::2], stubs[1::2]):
+        if left != right:
+            edges.add(tuple(sorted((left, right))))
+    for i, left in enumerate(clique):
+        for right in clique[i + 1:]:
+            edges.add(tuple(sorted((left, right))))
+    edges = sorted(edges)
+    rng.shuffle(edges)
+
+    return "\n".join(f"{left}-{right}" if rng.random() < 0.5 else f"{right}-{left}" for left, right in edges) + "\n"
+
+
+# Indices of gate pairs within one bit of the adder whose outputs can be swapped
+# without creating a cycle (see the gate order in generate_day_24). Swapping the two
+# inputs of the OR gate is left out, because it would not change the circuit
+DAY_24_SWAPPABLE_GATES = [(0, 1), (1, 2), (2, 3), (2, 4)]
+
+
+def generate_day_24(rng: random.Random, num_bits: int = 45, num_swaps: int = 4) -> str:
+    """
+    A ripple-carry adder for two num_bits wide numbers x and y with output z, in which
+    the outputs of num_swaps pairs of gates belonging to the same bit are swapped.
+    """
+    used_names = set()
+
+    def wire_name() -> str:
+        while True:
+            name = "".join(rng.choices(string.ascii_lowercase[:23], k=3))
+            if name not in used_names and name[0] not in "xyz":
+                used_names.add(name)
+                return name
+
+    gates = [[("x00", "XOR", "y00", "z00")]]
+    carry = wire_name()
+    gates[0].append(("x00", "AND", "y00", carry))
+    for bit in range(1, num_bits):
+        x, y, z = f"x{bit:02d}", f"y{bit:02d}", f"z{bit:02d}"
+        half_sum, half_carry, carry_through = wire_name(), wire_name(), wire_name()
+        next_carry = f"z{num_bits:02d}" if bit == num_bits - 1 else wire_name()
+        gates.append([
+            (x, "XOR", y, half_sum),
+            (x, "AND", y, half_carry),
+            (half_sum, "XOR", carry, z),
+            (half_sum, "AND", carry, carry_through),
+            (half_carry, "OR", carry_through, next_carry),
+        ])
+        carry = next_carry
+
+    # Only swap outputs of gates within the same bit that don't depend on each other,
+    # since everything else would create a cycle. Like in the official inputs, the
+    # swaps are spread over bits that are not adjacent to each other
+    while True:
+        swapped_bits = sorted(rng.sample(range(2, num_bits - 1), num_swaps))
+        if all(b - a >= 3 for a, b in itertools.pairwise(swapped_bits)):
+            break
+    for bit in swapped_bits:
+        first, second = rng.choice(DAY_24_SWAPPABLE_GATES)
+        in1_a, op_a, in2_a, out_a = gates[bit][first]
+        in1_b, op_b, in2_b, out_b = gates[bit][second]
+        gates[bit][first] = (in1_a, op_a, in2_a, out_b)
+        gates[bit][second] = (in1_b, op_b, in2_b, out_a)
+
+    gate_lines = [
+        f"{in1} {operation} {in2} -> {out}" if rng.random() < 0.5 else f"{in2} {operation} {in1} -> {out}"
+        for bit_gates in gates for in1, operation, in2, out in bit_gates
+    ]
+    rng.shuffle(gate_lines)
+    cable_lines = [f"{wire}{bit:02d}: {rng.randint(0, 1)}" for wire in "xy" for bit in range(num_bits)]
+
+    return "\n".join(cable_lines) + "\n\n" + "\n".join(gate_lines) + "\n"
+
+
+def generate_day_25(rng: random.Random, num_locks: int = 250, num_keys: int = 250, num_pins: int = 5) -> str:
+    blocks = []
+    for is_lock in [True] * num_locks + [False] * num_keys:
+        heights = [rng.randint(0, 5) for _ in range(num_pins)]
+        rows = []
+        for row in range(7):
+            if is_lock:
+                rows.append("".join("#" if row <= h else "." for h in heights))
+            else:
+                rows.append("".join("#" if 6 - row <= h else "." for h in heights))
+        blocks.append("\n".join(rows))
+    rng.shuffle(blocks)
+
+    return "\n\n".join(blocks) + "\n"
+
+
+GENERATORS: dict[int, Callable[..., str]] = {
+    int(name.rsplit("_", 1)[1]): function
+    for name, function in dict(globals()).items() if name.startswith("generate_day_")
+}
+
+
+def generate_input(day: int, seed: int = 0, **sizes: int | float) -> str:
+    return GENERATORS[day](random.Random(seed), **sizes)
+
+
+def check_generated_answers(seeds: range = range(3)):
+    """
+    Check that the generated inputs have the properties the generators promise, by
+    solving them with the days' own part functions (whose progress output is dropped).
+    """
+    with contextlib.redirect_stderr(io.StringIO()):
+        for seed in seeds:
+            for day in (6, 13):
+                module = load_day(day)
+                answer = DAY_PARTS[day][1](module, module.parse_input(generate_input(day, seed)))
+                assert answer > 0, f"Part 2 of day {day} is {answer} for seed {seed}."
+            module = load_day(19)
+            for possible_fraction in (0.25, 0.7):
+                text = generate_input(19, seed, num_designs=100, possible_fraction=possible_fraction)
+                num_possible_designs = DAY_PARTS[19][0](module, module.parse_input(text))
+                assert num_possible_designs == round(100 * possible_fraction), (
+                    f"{num_possible_designs} of 100 designs of day 19 are possible for seed {seed}, "
+                    f"expected {round(100 * possible_fraction)}."
+                )
+
+
+def parse_size_knob(knob: str) -> tuple[str, int | float]:
+    name, value = knob.split("=")
+    return name, float(value) if "." in value else int(value)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic puzzle inputs.")
+    parser.add_argument("days", nargs="*", type=int, default=sorted(GENERATORS), help="days (default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    parser.add_argument(
+        "--size", action="append", default=[], metavar="KNOB=VALUE",
+        help="size knob passed to all generators accepting it, e.g. side=500 (can be repeated)",
+    )
+    parser.add_argument("--output-dir", type=Path, help="directory to write the NN.txt files to")
+    parser.add_argument(
+        "--check", action="store_true", help="check the properties of the generated inputs instead of writing them"
+    )
+    args = parser.parse_args()
+    if args.check:
+        check_generated_answers()
+        print("The generated inputs have the expected answers.")
+        return
+    if args.output_dir is None:
+        parser.error("the following arguments are required: --output-dir")
+
+    sizes = dict(map(parse_size_knob, args.size))
+    args.output_dir.mkdir(parents=True, exist_ok=True)
+    for day in args.days:
+        # Each day only receives the knobs its generator knows about
+        knobs = inspect.signature(GENERATORS[day]).parameters
+        day_sizes = {name: value for name, value in sizes.items() if name in knobs}
+        with open(args.output_dir / f"{day:02d}.txt", "w") as fh:
+            fh.write(generate_input(day, args.seed, **day_sizes))
+
+
+if __name__ == "__main__":
+    main()
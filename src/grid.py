@@ -0,0 +1,74 @@
+"""
+Helpers for character grids. Hot loops walk over padded grids: the grid is surrounded
+by a border of sentinel cells and flattened row by row, so that every cell is a plain
+integer index, its four neighbors are found by adding a constant offset, and walking
+off the grid shows up as reaching a sentinel cell instead of needing bounds checks.
+"""
+import numpy as np
+
+# Fill value for the border of padded ASCII grids, which never occurs in any input
+BORDER = 0
+
+
+def load_grid(text: str) -> np.ndarray:
+    """
+    Turn a rectangular block of characters into a 2D uint8 array holding the ASCII code
+    of each character, e.g. grid == ord("#") marks all walls. The lines are stripped
+    (which also drops the \\r of CRLF line endings) and encoded together, and the array
+    is a read-only view on the encoded bytes, so no per-character Python objects are
+    created. Copy the grid before modifying it.
+    """
+    rows = [line.strip() for line in text.strip().split("\n")]
+    num_cols = len(rows[0])
+    for i, row in enumerate(rows):
+        if len(row) != num_cols:
+            raise ValueError(f"All rows of the grid must have the same length, but row {i} has {len(row)} "
+                             f"characters instead of {num_cols}.")
+    data = "".join(rows).encode()
+    if len(data) != len(rows) * num_cols:
+        raise ValueError("The grid must consist of ASCII characters.")
+
+    return np.frombuffer(data, dtype=np.uint8).reshape(len(rows), num_cols)
+
+
+def find_position(grid: np.ndarray, char: str) -> tuple[int, int]:
+    """
+    Return the position of the first occurrence of char in the grid (e.g. of the
+    start marker "S" or the robot "@").
+    """
+    positions = np.argwhere(grid == ord(char))
+    if len(positions) == 0:
+        raise ValueError(f"Character {char!r} not found in grid.")
+    i, j = positions[0]
+
+    return int(i), int(j)
+
+
+def pad_grid(grid: np.ndarray, fill_value, border: int = 1) -> tuple[list, int]:
+    """
+    Surround the grid with a border of fill_value cells and flatten it row by row.
+    Returns the flat cells as a list (indexing a list with Python ints is much faster
+    than indexing a NumPy array) and the width of the padded grid. A border wider than
+    one cell is needed if a walker jumps more than one cell at a time.
+    """
+    padded = np.pad(grid, border, constant_values=fill_value)
+
+    return padded.ravel().tolist(), padded.shape[1]
+
+
+def to_node(position: tuple[int, int], width: int, border: int = 1) -> int:
+    return (position[0] + border) * width + position[1] + border
+
+
+def to_position(node: int, width: int, border: int = 1) -> tuple[int, int]:
+    i, j = divmod(node, width)
+
+    return i - border, j - border
+
+
+def get_neighbor_offsets(width: int) -> list[int]:
+    """
+    Offsets to the neighbors of a cell in the padded grid,
+    in the order up, right, down, left.
+    """
+    return [-width, 1, width, -1]
@@ -0,0 +1,180 @@
+"""
+Registry of alternative implementations of the same part. The harness in main
+cross-checks that all implementations of a part return the same results on generated
+inputs of increasing size and records which one was the fastest at each size. At
+runtime, dispatch picks the implementation that was the fastest for the size closest
+to (and not larger than) the size of the given input.
+"""
+import argparse
+import copy
+import functools
+import json
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable
+
+from benchmark import time_function
+from days import DAY_PARTS, SRC_DIR, load_day
+from generators import generate_input
+
+DISPATCH_TABLE_PATH = SRC_DIR.parent / "benchmarks" / "dispatch.json"
+
+# Implementations of each (day, part). The first one is the default, which is used as
+# long as no measurements exist. Like in DAY_PARTS, an implementation receives the
+# imported day module and the output of its parse_input.
+IMPLEMENTATIONS: dict[tuple[int, int], dict[str, Callable[[ModuleType, Any], Any]]] = {
+    (2, 2): {
+        "linear": lambda m, d: m.find_safe_reports_including_problem_dampener_linear(*d),
+        "k_level": lambda m, d: m.find_safe_reports_with_dampener(*d, max_removals=1),
+        "refined": lambda m, d: m.find_safe_reports_including_problem_dampener(*d),
+        "brute_force": lambda m, d: m.find_safe_reports_including_problem_dampener_brute_force(*d),
+    },
+    # For cheats of length 2 there is no difference between cheats that may only go
+    # through walls and cheats that may go anywhere
+    (20, 1): {
+        "general": lambda m, d: m.pass_course_and_find_number_of_good_enough_cheats(*d, max_cheat_length=2),
+        "walls_only": lambda m, d:
+            m.pass_course_and_find_number_of_good_enough_cheats_if_a_cheat_could_only_go_through_walls(
+                *d, max_cheat_length=2
+            ),
+    },
+    (22, 1): {
+        "vectorized": lambda m, d: m.sum_secret_numbers_after_iterations(d, 2000),
+        "scalar": lambda m, d: sum(int(m.generate_pseudorandom_number(seed, 2000)[-1]) for seed in d),
+    },
+}
+
+# Size of a parsed input, in the unit of the generator knob of SIZE_KNOBS
+INPUT_SIZES: dict[int, Callable[[Any], int]] = {
+    2: lambda d: len(d[1]),
+    20: lambda d: d[0].shape[0],
+    22: len,
+}
+
+# Generator knob that scales the input of a day, and the sizes the harness measures
+SIZE_KNOBS: dict[int, tuple[str, tuple[int, ...]]] = {
+    2: ("num_reports", (10, 100, 1000, 10000)),
+    20: ("side", (21, 41, 81, 141)),
+    22: ("num_buyers", (10, 100, 1000, 2000)),
+}
+
+
+class ImplementationMismatchError(Exception):
+    pass
+
+
+@functools.cache
+def load_dispatch_table(path: Path = DISPATCH_TABLE_PATH) -> dict[str, list[tuple[int, str]]]:
+    """
+    Maps "<day>.<part>" to (size, name of the fastest implementation) pairs, sorted by size.
+    """
+    if not Path(path).exists():
+        return {}
+    with open(path, "r") as fh:
+        table = json.load(fh)
+
+    return {key: sorted((size, name) for size, name in entries) for key, entries in table.items()}
+
+
+def choose_implementation(day: int, part: int, size: int, table: dict[str, list[tuple[int, str]]]) -> str:
+    implementations = IMPLEMENTATIONS[day, part]
+    entries = [(s, name) for s, name in table.get(f"{day}.{part}", []) if name in implementations]
+    if not entries:
+        return next(iter(implementations))
+
+    # Use the measurement at the largest size not exceeding the input size. Inputs that
+    # are smaller than all measured sizes use the smallest one
+    chosen = entries[0][1]
+    for measured_size, name in entries:
+        if measured_size > size:
+            break
+        chosen = name
+
+    return chosen
+
+
+def dispatch(day: int, part: int) -> Callable[[ModuleType, Any], Any]:
+    """
+    Part function (see DAY_PARTS) that runs the fastest known implementation for the
+    size of its input.
+    """
+    def solver(module: ModuleType, parsed: Any) -> Any:
+        name = choose_implementation(day, part, INPUT_SIZES[day](parsed), load_dispatch_table())
+        return IMPLEMENTATIONS[day, part][name](module, parsed)
+
+    return solver
+
+
+def get_part_solver(day: int, part: int) -> Callable[[ModuleType, Any], Any]:
+    if (day, part) in IMPLEMENTATIONS:
+        return dispatch(day, part)
+
+    return DAY_PARTS[day][part - 1]
+
+
+def compare_implementations(
+        day: int,
+        part: int,
+        sizes: tuple[int, ...],
+        seed: int = 0,
+        repeat: int = 3,
+) -> list[dict]:
+    """
+    Run all implementations of the part on generated inputs of the given sizes. Raises
+    ImplementationMismatchError if they don't agree on an input. Returns the median
+    run time of each implementation per size.
+    """
+    module = load_day(day)
+    knob, _ = SIZE_KNOBS[day]
+    measurements = []
+    for size in sizes:
+        parsed = module.parse_input(generate_input(day, seed, **{knob: size}))
+        results = {}
+        timings = {}
+        for name, implementation in IMPLEMENTATIONS[day, part].items():
+            results[name] = implementation(module, copy.deepcopy(parsed))
+            timings[name] = time_function(
+                lambda d: implementation(module, d), lambda: copy.deepcopy(parsed), 0, repeat
+            )["median_ms"]
+        if len({str(result) for result in results.values()}) > 1:
+            raise ImplementationMismatchError(f"Day {day} part {part}, {knob}={size}: {results}")
+        measurements.append({"size": INPUT_SIZES[day](parsed), "median_ms": timings})
+
+    return measurements
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-check alternative implementations and measure crossovers.")
+    parser.add_argument("days", nargs="*", type=int, help="days to check (default: all with alternatives)")
+    parser.add_argument("--seed", type=int, default=0, help="random seed of the generated inputs")
+    parser.add_argument("--repeat", type=int, default=3, help="measured calls per implementation and size")
+    parser.add_argument("--save", action="store_true", help="write the fastest implementations to the dispatch table")
+    args = parser.parse_args()
+
+    keys = [key for key in IMPLEMENTATIONS if not args.days or key[0] in args.days]
+    table = {}
+    for day, part in keys:
+        _, sizes = SIZE_KNOBS[day]
+        entries = []
+        for measurement in compare_implementations(day, part, sizes, args.seed, args.repeat):
+            timings = measurement["median_ms"]
+            fastest = min(timings, key=timings.get)
+            entries.append((measurement["size"], fastest))
+            line = ", ".join(f"{name} {ms:.2f} ms" for name, ms in timings.items())
+            print(f"Day {day:02d} Part {part} (size {measurement['size']}): {line}. Fastest: {fastest}.")
+        crossovers = [size for (_, previous), (size, name) in zip(entries, entries[1:]) if name != previous]
+        if crossovers:
+            print(f"Day {day:02d} Part {part}: fastest implementation changes at sizes {crossovers}.")
+        table[f"{day}.{part}"] = entries
+
+    if args.save:
+        DISPATCH_TABLE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        existing = dict(load_dispatch_table())
+        existing.update(table)
+        with open(DISPATCH_TABLE_PATH, "w") as fh:
+            json.dump(existing, fh, indent=2)
+        print(f"Saved dispatch table to {DISPATCH_TABLE_PATH}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+import contextlib
+import cProfile
+import functools
+import json
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Callable, Iterator
+
+from sampling_profiler import SamplingProfiler
+
+# Measurements of all calls of functions decorated with @instrumented
+RECORDS: list[dict] = []
+
+
+@contextlib.contextmanager
+def measure(
+        name: str,
+        trace_memory: bool = False,
+        profile_dir: Path | None = None,
+        sample_dir: Path | None = None,
+) -> Iterator[dict]:
+    """
+    Measure wall time and CPU time of the enclosed block. With trace_memory, the peak of
+    the memory allocated within the block is recorded via tracemalloc (which slows the
+    block down considerably). With a profile_dir, the block runs under cProfile and the
+    statistics are dumped to <profile_dir>/<name>.prof. With a sample_dir, the block is
+    profiled by the much less intrusive SamplingProfiler and the collapsed stacks are
+    written to <sample_dir>/<name>.folded. The yielded record is filled in when the
+    block is left.
+    """
+    record = {
+        "name": name, "wall_ms": None, "cpu_ms": None, "peak_memory_kib": None, "profile": None, "samples": None,
+    }
+
+    already_tracing = tracemalloc.is_tracing()
+    if trace_memory:
+        if not already_tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        memory_at_start, _ = tracemalloc.get_traced_memory()
+    profiler = cProfile.Profile() if profile_dir is not None else None
+    sampler = SamplingProfiler() if sample_dir is not None else None
+
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    if profiler is not None:
+        profiler.enable()
+    if sampler is not None:
+        sampler.start()
+    try:
+        yield record
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        if profiler is not None:
+            profiler.disable()
+        cpu_end = time.process_time()
+        wall_end = time.perf_counter()
+        record["wall_ms"] = (wall_end - wall_start) * 1000
+        record["cpu_ms"] = (cpu_end - cpu_start) * 1000
+
+        if trace_memory:
+            _, peak_memory = tracemalloc.get_traced_memory()
+            # noinspection PyUnboundLocalVariable
+            record["peak_memory_kib"] = (peak_memory - memory_at_start) / 1024
+            if not already_tracing:
+                tracemalloc.stop()
+
+        if profiler is not None:
+            profile_dir.mkdir(parents=True, exist_ok=True)
+            profile_path = profile_dir / f"{name}.prof"
+            profiler.dump_stats(profile_path)
+            record["profile"] = str(profile_path)
+
+        if sampler is not None:
+            sample_dir.mkdir(parents=True, exist_ok=True)
+            samples_path = sample_dir / f"{name}.folded"
+            sampler.dump_collapsed_stacks(samples_path)
+            record["samples"] = str(samples_path)
+
+
+def instrumented(
+        name: str | None = None,
+        trace_memory: bool = False,
+        profile_dir: Path | None = None,
+        sample_dir: Path | None = None,
+) -> Callable[[Callable], Callable]:
+    """
+    Decorator version of measure. The record of every call is appended to RECORDS.
+    """
+    def decorator(function: Callable) -> Callable:
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with measure(name or function.__name__, trace_memory, profile_dir, sample_dir) as record:
+                result = function(*args, **kwargs)
+            RECORDS.append(record)
+            return result
+
+        return wrapper
+
+    return decorator
+
+
+def format_record(record: dict) -> str:
+    line = f"{record['wall_ms']:.2f} ms (CPU {record['cpu_ms']:.2f} ms"
+    if record["peak_memory_kib"] is not None:
+        line += f", peak memory {record['peak_memory_kib']:.1f} KiB"
+
+    return line + ")"
+
+
+def dump_records(records: list[dict], path: Path):
+    with open(path, "w") as fh:
+        # Results of the parts may be NumPy scalars, which json can't serialize
+        json.dump(records, fh, indent=2, default=str)
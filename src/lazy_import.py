@@ -0,0 +1,90 @@
+import argparse
+import importlib
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+SRC_DIR = Path(__file__).resolve().parent
+
+# Time in ms it took to import each lazily imported module on first use
+IMPORT_TIMES: dict[str, float] = {}
+
+
+class LazyModule:
+    """
+    Stand-in for a module that is imported only when one of its attributes is accessed
+    for the first time. Heavy third-party dependencies that are only needed by some code
+    paths thus don't slow down the startup of a day.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def _load(self) -> ModuleType:
+        if self._module is None:
+            start = time.perf_counter()
+            self._module = importlib.import_module(self._name)
+            end = time.perf_counter()
+            IMPORT_TIMES[self._name] = (end - start) * 1000
+
+        return self._module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._load(), attr)
+
+    def __repr__(self) -> str:
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module '{self._name}' ({state})>"
+
+
+def lazy_import(name: str) -> LazyModule:
+    return LazyModule(name)
+
+
+def load_lazy_modules(module: ModuleType) -> list[str]:
+    """
+    Import all lazily imported modules referenced in the namespace of the given module
+    right away, e.g. to warm up a long-running process. Returns their names.
+    """
+    names = []
+    for value in vars(module).values():
+        if isinstance(value, LazyModule):
+            value._load()
+            names.append(value._name)
+
+    return names
+
+
+def measure_cold_import_time(module_name: str) -> float:
+    """
+    Import the module in a fresh interpreter, so that none of its dependencies
+    are already cached, and return the import time in ms.
+    """
+    code = (
+        "import importlib, time\n"
+        "start = time.perf_counter()\n"
+        f"importlib.import_module({module_name!r})\n"
+        "print((time.perf_counter() - start) * 1000)\n"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=SRC_DIR, capture_output=True, text=True, check=True
+    ).stdout
+
+    return float(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report the cold import time of the day modules.")
+    parser.add_argument("days", nargs="*", type=int, default=range(1, 26), help="days to measure (default: all)")
+    args = parser.parse_args()
+
+    for day in args.days:
+        print(f"Day {day:02d}: import took {measure_cold_import_time(f'{day:02d}'):.2f} ms.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import codecs
+import io
+import mmap
+import os
+from pathlib import Path
+from typing import Iterable, Iterator
+
+DEFAULT_CHUNK_SIZE = 1024 ** 2
+
+
+def read_lines(path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Lazily yield the stripped, non-empty lines of a file. The file is memory-mapped and
+    decoded in chunks of about chunk_size bytes (extended to the next line break), so
+    memory use is bounded by the chunk size rather than by the size of the file.
+    """
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size == 0:
+            # Empty files can't be memory-mapped
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            while start < size:
+                end = min(start + chunk_size, size)
+                if end < size:
+                    newline = mm.find(b"\n", end)
+                    end = size if newline == -1 else newline + 1
+                for line in mm[start:end].decode().splitlines():
+                    line = line.strip()
+                    if line:
+                        yield line
+                start = end
+
+
+def iter_lines(source: str | Iterable[str]) -> Iterator[str]:
+    """
+    Yield the stripped, non-empty lines of either a text or an iterable of lines (e.g.
+    read_lines or an open file). Unlike text.strip().split("\\n"), a text is split
+    lazily, so neither a stripped copy nor a list of all lines is created.
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+    for line in source:
+        line = line.strip()
+        if line:
+            yield line
+
+
+def read_text_chunks(path: str | Path, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[str]:
+    """
+    Lazily yield the text of a file in chunks decoded from chunk_size bytes each. Unlike
+    read_lines, the chunks are cut at arbitrary positions (but never within a character),
+    so memory use is bounded even for files without line breaks.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    with open(path, "rb") as fh:
+        while data := fh.read(chunk_size):
+            if text := decoder.decode(data):
+                yield text
+    if text := decoder.decode(b"", final=True):
+        yield text
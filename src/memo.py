@@ -0,0 +1,157 @@
+"""
+Bounded memoization with hit/miss statistics for the recursive days. A Memo is a lookup
+table whose size can be capped, either by evicting the least recently used entry ("lru")
+or by not storing any more entries once it is full ("cap"). Its scope is chosen
+explicitly: memo_scope creates a table that lives for a single call or a single input,
+and memoize attaches a global one to a function. Statistics of finished scopes are
+collected per name, so that get_memo_stats covers both.
+"""
+import contextlib
+import functools
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Iterator
+
+# Returned by Memo.get if the key is not in the table (None may be a memoized value)
+MISSING = object()
+
+POLICIES = ("lru", "cap")
+
+# Accumulated statistics of memo_scope tables that have been left, by name
+MEMO_STATS: dict[str, dict] = {}
+
+# Tables of functions decorated with @memoize, by name
+GLOBAL_MEMOS: dict[str, "Memo"] = {}
+
+
+class Memo:
+    def __init__(self, name: str, max_size: int | None = None, policy: str = "lru"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown eviction policy {policy!r}, must be one of {POLICIES}.")
+        self.name = name
+        self.max_size = max_size
+        self.policy = policy
+        self._entries = OrderedDict() if policy == "lru" else {}
+        self._move_to_end = policy == "lru" and max_size is not None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.peak_size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any:
+        value = self._entries.get(key, MISSING)
+        if value is MISSING:
+            self.misses += 1
+            return MISSING
+        self.hits += 1
+        if self._move_to_end:
+            self._entries.move_to_end(key)
+
+        return value
+
+    def put(self, key: Hashable, value: Any):
+        entries = self._entries
+        if self.max_size is not None and len(entries) >= self.max_size and key not in entries:
+            self.evictions += 1
+            if self.policy == "cap":
+                return
+            entries.popitem(last=False)
+        entries[key] = value
+        if len(entries) > self.peak_size:
+            self.peak_size = len(entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def reset_stats(self):
+        self.hits = self.misses = self.evictions = 0
+        self.peak_size = len(self._entries)
+
+    def get_stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else None,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "peak_size": self.peak_size,
+            "max_size": self.max_size,
+        }
+
+
+def record_stats(memo: Memo):
+    stats = memo.get_stats()
+    total = MEMO_STATS.setdefault(memo.name, {"hits": 0, "misses": 0, "evictions": 0, "peak_size": 0, "scopes": 0})
+    total["hits"] += stats["hits"]
+    total["misses"] += stats["misses"]
+    total["evictions"] += stats["evictions"]
+    total["peak_size"] = max(total["peak_size"], stats["peak_size"])
+    total["max_size"] = stats["max_size"]
+    total["scopes"] += 1
+    lookups = total["hits"] + total["misses"]
+    total["hit_rate"] = total["hits"] / lookups if lookups else None
+
+
+@contextlib.contextmanager
+def memo_scope(name: str, max_size: int | None = None, policy: str = "lru") -> Iterator[Memo]:
+    """
+    Table that is dropped when the block is left, e.g. to memoize within a single
+    call or for a single input. Its statistics are added to MEMO_STATS[name].
+    """
+    memo = Memo(name, max_size, policy)
+    try:
+        yield memo
+    finally:
+        record_stats(memo)
+        memo.clear()
+
+
+def memoize(
+        name: str | None = None,
+        max_size: int | None = None,
+        policy: str = "lru",
+        key: Callable[..., Hashable] | None = None,
+) -> Callable[[Callable], Callable]:
+    """
+    Decorator memoizing a function in a global table, which is available as the memo
+    attribute of the decorated function. The table is keyed by the positional arguments,
+    or by key(*args) if given, e.g. to drop arguments that don't influence the result.
+    """
+    def decorator(function: Callable) -> Callable:
+        memo = Memo(name or function.__qualname__, max_size, policy)
+        GLOBAL_MEMOS[memo.name] = memo
+
+        @functools.wraps(function)
+        def wrapper(*args):
+            memo_key = args if key is None else key(*args)
+            value = memo.get(memo_key)
+            if value is MISSING:
+                value = function(*args)
+                memo.put(memo_key, value)
+            return value
+
+        wrapper.memo = memo
+        return wrapper
+
+    return decorator
+
+
+def get_memo_stats() -> dict[str, dict]:
+    stats = {name: dict(total) for name, total in MEMO_STATS.items()}
+    for name, memo in GLOBAL_MEMOS.items():
+        stats[name] = memo.get_stats()
+
+    return stats
+
+
+def reset_memo_stats():
+    """
+    Forget the statistics of finished scopes and reset the counters (but not the
+    entries) of the global tables.
+    """
+    MEMO_STATS.clear()
+    for memo in GLOBAL_MEMOS.values():
+        memo.reset_stats()
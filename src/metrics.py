@@ -0,0 +1,63 @@
+"""
+Counters and histograms of the algorithmic work done by the hot loops, e.g. the number
+of heap pushes of a search. Collection is off by default. Hot loops count in local
+variables and only report their totals at the end, guarded by "if metrics.ENABLED:",
+so that the overhead is negligible when collection is disabled. Since ENABLED can be
+switched at runtime, import this module as a whole instead of importing its names.
+"""
+import json
+import math
+from pathlib import Path
+
+ENABLED = False
+
+COUNTERS: dict[str, int] = {}
+
+# Each histogram holds the number of observations per power-of-two bucket, where
+# bucket b contains the values from 2 ** (b - 1) to 2 ** b - 1 (and bucket 0 the zeros)
+HISTOGRAMS: dict[str, dict] = {}
+
+
+def set_enabled(enabled: bool):
+    global ENABLED
+    ENABLED = enabled
+
+
+def increment(name: str, amount: int = 1):
+    COUNTERS[name] = COUNTERS.get(name, 0) + amount
+
+
+def observe(name: str, value: int | float):
+    histogram = HISTOGRAMS.get(name)
+    if histogram is None:
+        histogram = HISTOGRAMS[name] = {"count": 0, "sum": 0, "min": math.inf, "max": -math.inf, "buckets": {}}
+    histogram["count"] += 1
+    histogram["sum"] += value
+    histogram["min"] = min(histogram["min"], value)
+    histogram["max"] = max(histogram["max"], value)
+    bucket = int(value).bit_length() if value > 0 else 0
+    histogram["buckets"][bucket] = histogram["buckets"].get(bucket, 0) + 1
+
+
+def snapshot() -> dict:
+    histograms = {}
+    for name, histogram in HISTOGRAMS.items():
+        histograms[name] = {
+            "count": histogram["count"],
+            "mean": histogram["sum"] / histogram["count"],
+            "min": histogram["min"],
+            "max": histogram["max"],
+            "buckets": {f"<{2 ** bucket}": count for bucket, count in sorted(histogram["buckets"].items())},
+        }
+
+    return {"counters": dict(COUNTERS), "histograms": histograms}
+
+
+def reset():
+    COUNTERS.clear()
+    HISTOGRAMS.clear()
+
+
+def dump_metrics(metrics: dict, path: Path):
+    with open(path, "w") as fh:
+        json.dump(metrics, fh, indent=2)
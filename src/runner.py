@@ -0,0 +1,358 @@
+import argparse
+import contextlib
+import io
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from pathlib import Path
+from typing import Any
+
+import metrics
+from cache import CACHE_DIR, ResultCache, get_cache_key, get_function_source_hash, get_source_hash
+from days import ALL_DAYS, DAY_PARTS, FUSED_SOLVERS, INPUTS_DIR, SRC_DIR, get_input_path, get_solvers, load_day
+from implementations import get_part_solver
+from instrumentation import dump_records, format_record, measure
+from memo import get_memo_stats, reset_memo_stats
+from sampling_profiler import check_sampling_support
+
+
+def create_report(day: int, input_path: Path) -> dict:
+    return {
+        "day": day, "input": str(input_path), "parse": None, "parts": [], "solve": None,
+        "total_ms": None, "error": None,
+    }
+
+
+def prepare_input(
+        day: int,
+        input_path: Path,
+        trace_memory: bool = False,
+        profile_dir: Path | None = None,
+        cache: ResultCache | None = None,
+        sample_dir: Path | None = None,
+) -> dict:
+    """
+    First stage of solving an input: read the input file and, with a cache, look up
+    the answers and the parsed input. The input is only parsed if at least one answer
+    is missing. Returns a job with the report (so far containing the parse measurement),
+    the parsed input, the cached answers, the names of the missing answers and the
+    cache keys of all answers. The total time of the report is the time of this stage.
+    """
+    report = create_report(day, input_path)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        module = load_day(day)
+        with open(input_path, "r") as fh:
+            in_text = fh.read()
+        solvers = get_solvers(day, get_part_solver)
+        answer_keys = {}
+        answers = {}
+        if cache is not None:
+            # Changes to the solving code of the day don't invalidate the parsed input
+            parse_key = get_cache_key(in_text, get_function_source_hash(module.parse_input), "parse")
+            # Answers also depend on the arguments the parts are called with
+            answer_hash = get_source_hash(module, (SRC_DIR / "days.py",))
+            for name in solvers:
+                answer_keys[name] = get_cache_key(in_text, answer_hash, name)
+                hit, answer = cache.get(day, name, answer_keys[name])
+                if hit:
+                    answers[name] = answer
+
+        parsed = None
+        missing = [name for name in solvers if name not in answers]
+        if missing:
+            hit = False
+            if cache is not None:
+                hit, parsed = cache.get(day, "parse", parse_key)
+            if not hit:
+                with measure(f"day{day:02d}_parse", trace_memory, profile_dir, sample_dir) as record:
+                    parsed = module.parse_input(in_text)
+                report["parse"] = record
+                if cache is not None:
+                    cache.put(day, "parse", parse_key, parsed)
+    report["total_ms"] = (time.perf_counter() - start) * 1000
+
+    return {"report": report, "parsed": parsed, "answers": answers, "missing": missing, "answer_keys": answer_keys}
+
+
+def solve_part(
+        day: int,
+        name: str,
+        parsed: Any,
+        answer_key: str | None = None,
+        trace_memory: bool = False,
+        profile_dir: Path | None = None,
+        cache: ResultCache | None = None,
+        sample_dir: Path | None = None,
+        collect_metrics: bool = False,
+) -> tuple[Any, dict]:
+    """
+    Second stage: compute a single answer ("part_1", ..., or "solve" for fused days)
+    from the parsed input and store it in the cache under answer_key. Parts don't
+    depend on each other, so this may run in a different process than prepare_input
+    and the other parts. Returns the answer and its measurement.
+
+    With collect_metrics, the counters and histograms of the algorithmic work (see
+    metrics) are added to the measurement.
+    """
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        module = load_day(day)
+        solver = get_solvers(day, get_part_solver)[name]
+        metrics.set_enabled(collect_metrics)
+        reset_memo_stats()
+        metrics.reset()
+        with measure(f"day{day:02d}_{name}", trace_memory, profile_dir, sample_dir) as record:
+            answer = solver(module, parsed)
+        # Effectiveness of the memoization tables used by the part (if any)
+        record["memo"] = {
+            memo_name: stats for memo_name, stats in get_memo_stats().items()
+            if stats["hits"] + stats["misses"] > 0
+        }
+        if collect_metrics:
+            record["metrics"] = metrics.snapshot()
+        if cache is not None and answer_key is not None:
+            cache.put(day, name, answer_key, answer)
+
+    return answer, record
+
+
+def complete_report(report: dict, answers: dict[str, Any], measurements: dict[str, dict]):
+    if report["day"] in FUSED_SOLVERS:
+        # The measurement of a fused solve can't be attributed to a single part
+        report["solve"] = measurements.get("solve")
+        report["parts"] = [{"result": result, "measurement": None} for result in answers["solve"]]
+    else:
+        report["parts"] = [
+            {"result": answers[name], "measurement": measurements.get(name)}
+            for name in get_solvers(report["day"], get_part_solver)
+        ]
+
+
+def solve_input(
+        day: int,
+        input_path: Path,
+        trace_memory: bool = False,
+        profile_dir: Path | None = None,
+        cache: ResultCache | None = None,
+        sample_dir: Path | None = None,
+        collect_metrics: bool = False,
+) -> dict:
+    """
+    Import the module of the given day, parse the input file and solve all parts of
+    the day one after another in this process. Anything the day prints (progress bars,
+    images, ...) is swallowed so that the output of concurrently running days does not
+    get mixed up.
+    """
+    report = create_report(day, input_path)
+    day_start = time.perf_counter()
+    try:
+        job = prepare_input(day, input_path, trace_memory, profile_dir, cache, sample_dir)
+        report = job["report"]
+        measurements = {}
+        for name in job["missing"]:
+            job["answers"][name], measurements[name] = solve_part(
+                day, name, job["parsed"], job["answer_keys"].get(name), trace_memory, profile_dir, cache,
+                sample_dir, collect_metrics,
+            )
+        complete_report(report, job["answers"], measurements)
+    except Exception as e:
+        report["error"] = f"{type(e).__name__}: {e}"
+    report["total_ms"] = (time.perf_counter() - day_start) * 1000
+
+    return report
+
+
+def solve_day(
+        day: int,
+        inputs_dir: Path = INPUTS_DIR,
+        trace_memory: bool = False,
+        profile_dir: Path | None = None,
+        cache: ResultCache | None = None,
+        sample_dir: Path | None = None,
+        collect_metrics: bool = False,
+) -> dict:
+    return solve_input(
+        day, get_input_path(day, inputs_dir), trace_memory, profile_dir, cache, sample_dir, collect_metrics
+    )
+
+
+def run_days(
+        days: list[int],
+        inputs_dir: Path = INPUTS_DIR,
+        max_workers: int | None = None,
+        trace_memory: bool = False,
+        profile_dir: Path | None = None,
+        cache: ResultCache | None = None,
+        sample_dir: Path | None = None,
+        collect_metrics: bool = False,
+) -> list[dict]:
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(
+                solve_day, day, inputs_dir, trace_memory, profile_dir, cache, sample_dir, collect_metrics
+            )
+            for day in days
+        ]
+        reports = [future.result() for future in as_completed(futures)]
+
+    return sorted(reports, key=lambda r: r["day"])
+
+
+def run_days_with_parallel_parts(
+        days: list[int],
+        inputs_dir: Path = INPUTS_DIR,
+        max_workers: int | None = None,
+        trace_memory: bool = False,
+        profile_dir: Path | None = None,
+        cache: ResultCache | None = None,
+        sample_dir: Path | None = None,
+        collect_metrics: bool = False,
+) -> list[dict]:
+    """
+    Like run_days, but the parts of a day are solved in separate tasks as soon as its
+    input is parsed, so that the parts of slow days run in parallel as well. Every part
+    receives its own copy of the parsed input, so parts that modify it in place can't
+    affect each other. The total time of a day is the time its tasks spent in the
+    workers, not including the time they waited for a free worker.
+    """
+    reports = {}
+    answers = {day: {} for day in days}
+    measurements = {day: {} for day in days}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        pending = {}
+        for day in days:
+            input_path = get_input_path(day, inputs_dir)
+            reports[day] = create_report(day, input_path)
+            future = executor.submit(prepare_input, day, input_path, trace_memory, profile_dir, cache, sample_dir)
+            pending[future] = (day, None)
+        remaining_parts = {}
+
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                day, name = pending.pop(future)
+                report = reports[day]
+                if report["error"] is not None:
+                    # Another task of the day already failed
+                    continue
+                try:
+                    result = future.result()
+                except Exception as e:
+                    report["error"] = f"{type(e).__name__}: {e}"
+                    report["total_ms"] = report["total_ms"] or 0.0
+                    continue
+
+                if name is None:
+                    report["parse"] = result["report"]["parse"]
+                    report["total_ms"] = result["report"]["total_ms"]
+                    answers[day] = result["answers"]
+                    remaining_parts[day] = len(result["missing"])
+                    for missing_name in result["missing"]:
+                        part_future = executor.submit(
+                            solve_part, day, missing_name, result["parsed"], result["answer_keys"].get(missing_name),
+                            trace_memory, profile_dir, cache, sample_dir, collect_metrics,
+                        )
+                        pending[part_future] = (day, missing_name)
+                else:
+                    answers[day][name], measurements[day][name] = result
+                    report["total_ms"] += measurements[day][name]["wall_ms"]
+                    remaining_parts[day] -= 1
+
+                if remaining_parts[day] == 0:
+                    complete_report(report, answers[day], measurements[day])
+
+    return [reports[day] for day in sorted(reports)]
+
+
+def get_metrics_by_part(reports: list[dict]) -> dict[str, dict]:
+    """
+    Metrics of all computed parts (and fused solves), keyed by the measurement name.
+    """
+    metrics_by_part = {}
+    for report in reports:
+        for record in [part["measurement"] for part in report["parts"]] + [report["solve"]]:
+            if record is not None and "metrics" in record:
+                metrics_by_part[record["name"]] = record["metrics"]
+
+    return metrics_by_part
+
+
+def format_report(report: dict) -> str:
+    line = f"Day {report['day']:02d}:"
+    if report["error"] is not None:
+        return f"{line} FAILED ({report['error']}). Took {report['total_ms']:.2f} ms."
+    if report["parse"] is not None:
+        line += f" Parsing took {format_record(report['parse'])}."
+    for i, part in enumerate(report["parts"]):
+        line += f" Part {i + 1} Result: {part['result']}."
+        if part["measurement"] is not None:
+            line += f" Took {format_record(part['measurement'])}."
+        elif report["solve"] is None:
+            line += " (cached)"
+    if report["solve"] is not None:
+        line += f" Parts solved together in {format_record(report['solve'])}."
+
+    return line + f" Total {report['total_ms']:.2f} ms."
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solve several days concurrently in a process pool.")
+    parser.add_argument("days", nargs="*", type=int, default=ALL_DAYS, help="days to solve (default: all)")
+    parser.add_argument("--inputs-dir", type=Path, default=INPUTS_DIR, help="directory containing NN.txt inputs")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument(
+        "--parallel-parts", action="store_true", help="parse each input once and solve its parts in parallel tasks"
+    )
+    parser.add_argument(
+        "--trace-memory", action="store_true", help="record the peak memory of each part (slows parts down)"
+    )
+    parser.add_argument("--profile-dir", type=Path, help="dump a cProfile .prof file per part into this directory")
+    parser.add_argument(
+        "--sample-dir", type=Path, help="write collapsed stacks of a sampling profiler per part into this directory"
+    )
+    parser.add_argument("--json", type=Path, help="write the reports of all days to this JSON file")
+    parser.add_argument(
+        "--metrics", type=Path, help="count the algorithmic work of each part and write the counts to this JSON file"
+    )
+    parser.add_argument("--cache-dir", type=Path, default=CACHE_DIR, help="directory of the answer and parse cache")
+    parser.add_argument("--cache-size-mb", type=int, default=512, help="maximum size of the cache")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write the cache")
+    parser.add_argument("--invalidate-cache", action="store_true", help="drop cached entries of the given days")
+    args = parser.parse_args()
+
+    unknown_days = set(args.days) - set(DAY_PARTS)
+    if unknown_days:
+        parser.error(f"Unknown days: {sorted(unknown_days)}")
+    if args.sample_dir is not None:
+        try:
+            check_sampling_support()
+        except RuntimeError as e:
+            parser.error(f"--sample-dir: {e}")
+
+    cache = None
+    if not args.no_cache:
+        cache = ResultCache(args.cache_dir, args.cache_size_mb * 1024 ** 2)
+        if args.invalidate_cache:
+            for day in args.days:
+                cache.invalidate(day)
+
+    start = time.perf_counter()
+    run = run_days_with_parallel_parts if args.parallel_parts else run_days
+    reports = run(
+        args.days, args.inputs_dir, args.workers, args.trace_memory, args.profile_dir, cache, args.sample_dir,
+        args.metrics is not None,
+    )
+    end = time.perf_counter()
+
+    for report in reports:
+        print(format_report(report))
+    sequential_ms = sum(report["total_ms"] for report in reports)
+    print(f"Solved {len(reports)} days. Took {(end - start) * 1000:.2f} ms (sum of days: {sequential_ms:.2f} ms).")
+    if args.json is not None:
+        dump_records(reports, args.json)
+    if args.metrics is not None:
+        metrics.dump_metrics(get_metrics_by_part(reports), args.metrics)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Statistical profiler for the tight loops of the days. Unlike cProfile, which hooks into
+every function call and thus distorts code that mostly consists of small calls, it
+interrupts the process every few milliseconds of CPU time via SIGPROF and records the
+current call stack. The stacks are written in the collapsed format of flamegraph.pl
+(and compatible viewers such as speedscope): one line per distinct stack, with the
+frames separated by semicolons and followed by the number of samples.
+"""
+import contextlib
+import signal
+import sys
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Iterator
+
+DEFAULT_INTERVAL_S = 0.001
+
+
+def format_code(code: CodeType) -> str:
+    # The first line number tells apart the many lambdas of a module
+    return f"{code.co_name} ({Path(code.co_filename).stem}:{code.co_firstlineno})"
+
+
+def format_frame(frame: FrameType) -> str:
+    return format_code(frame.f_code)
+
+
+def check_sampling_support():
+    """
+    Raise a RuntimeError if the platform lacks the signals the profiler relies on.
+    """
+    if not hasattr(signal, "setitimer") or not hasattr(signal, "SIGPROF"):
+        raise RuntimeError("Sampling requires signal.setitimer and SIGPROF, which are not available on this platform.")
+
+
+class SamplingProfiler:
+    """
+    Only the frames below the one that started the profiler are recorded, so that the
+    stacks begin at the profiled code rather than at the runner or the process pool.
+    SIGPROF handlers can only be installed in the main thread and only on Unix.
+    """
+
+    def __init__(self, interval_s: float = DEFAULT_INTERVAL_S):
+        self.interval_s = interval_s
+        self.stacks: Counter[str] = Counter()
+        # The frames are referenced, not just their ids, so that the ids aren't reused
+        # by profiled frames once short-lived outer frames (e.g. the __enter__ of a
+        # context manager starting the profiler) have returned
+        self._outer_frames: dict[int, FrameType] = {}
+        self._previous_handler = None
+
+    def _sample(self, signum: int, frame: FrameType | None):
+        stack = []
+        while frame is not None and id(frame) not in self._outer_frames:
+            stack.append(format_frame(frame))
+            frame = frame.f_back
+        if stack:
+            self.stacks[";".join(reversed(stack))] += 1
+
+    def start(self):
+        check_sampling_support()
+        frame = sys._getframe(1)
+        while frame is not None:
+            self._outer_frames[id(frame)] = frame
+            frame = frame.f_back
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, self.interval_s, self.interval_s)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_PROF, 0)
+        signal.signal(signal.SIGPROF, self._previous_handler)
+        self._outer_frames.clear()
+
+    def dump_collapsed_stacks(self, path: Path):
+        with open(path, "w") as fh:
+            for stack, count in sorted(self.stacks.items()):
+                fh.write(f"{stack} {count}\n")
+
+
+def check_common_root(num_sessions: int = 5, num_nodes: int = 100_000):
+    """
+    Profile a neighbour-listing workload like that of the BFS days, started from a
+    context manager like in instrumentation.measure, and check that all stacks begin at
+    the profiled function. Stacks that begin deeper down mean that the frames of the
+    workload were mistaken for outer ones.
+    """
+    @contextlib.contextmanager
+    def sampled(profiler: SamplingProfiler) -> Iterator[None]:
+        profiler.start()
+        try:
+            yield
+        finally:
+            profiler.stop()
+
+    def workload() -> int:
+        offsets = [-1, 1, -num_nodes, num_nodes]
+
+        def get_neighbors(node: int) -> list[int]:
+            return [node + offset for offset in offsets if 0 <= node + offset < num_nodes]
+
+        return sum(len(get_neighbors(node)) for node in range(num_nodes))
+
+    for _ in range(num_sessions):
+        profiler = SamplingProfiler(interval_s=0.0001)
+        with sampled(profiler):
+            workload()
+        roots = {stack.split(";")[0] for stack in profiler.stacks}
+        assert profiler.stacks, "No samples were taken."
+        assert roots == {format_code(workload.__code__)}, f"Stacks have different roots: {sorted(roots)}"
+
+
+if __name__ == "__main__":
+    check_common_root()
+    print("All sampled stacks share the same root.")
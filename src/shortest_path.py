@@ -0,0 +1,133 @@
+"""
+Shortest-path searches on graphs with integer node ids. Grids are turned into such
+graphs with grid.pad_grid, so that a cell's id is its index in the flattened padded grid
+and its neighbors are reached by adding the offsets of grid.get_neighbor_offsets.
+Searches over (cell, state) pairs, e.g. the direction a cell was entered from, use the
+node id cell * num_states + state.
+"""
+import heapq
+import math
+from collections import deque
+from typing import Callable, Iterable
+
+import metrics
+
+
+def bfs(
+        num_nodes: int,
+        sources: Iterable[int],
+        get_neighbors: Callable[[int], Iterable[int]],
+        target: int | None = None,
+        max_distance: int | None = None,
+) -> list[int]:
+    """
+    Breadth-first search for graphs in which every edge has length 1. Returns the
+    distance of every node from the closest source (-1 for unreached nodes). The search
+    stops early once the target is reached, and nodes at max_distance aren't expanded.
+    """
+    distances = [-1] * num_nodes
+    queue = deque()
+    for source in sources:
+        distances[source] = 0
+        queue.append(source)
+
+    num_expanded_nodes = 0
+    while queue:
+        node = queue.popleft()
+        if node == target:
+            break
+        num_expanded_nodes += 1
+        next_distance = distances[node] + 1
+        if max_distance is not None and next_distance > max_distance:
+            break
+        for neighbor in get_neighbors(node):
+            if distances[neighbor] < 0:
+                distances[neighbor] = next_distance
+                queue.append(neighbor)
+
+    if metrics.ENABLED:
+        metrics.increment("bfs.searches")
+        metrics.increment("bfs.expanded_nodes", num_expanded_nodes)
+        metrics.observe("bfs.expanded_nodes_per_search", num_expanded_nodes)
+
+    return distances
+
+
+def local_bfs(
+        source: int,
+        get_neighbors: Callable[[int], Iterable[int]],
+        max_distance: int,
+) -> dict[int, int]:
+    """
+    Like bfs, but for searches that only explore a small neighborhood of the source
+    in a large graph. The distances of the reached nodes are kept in a dictionary
+    instead of an array over all nodes.
+    """
+    distances = {source: 0}
+    queue = deque([source])
+    while queue:
+        node = queue.popleft()
+        next_distance = distances[node] + 1
+        if next_distance > max_distance:
+            break
+        for neighbor in get_neighbors(node):
+            if neighbor not in distances:
+                distances[neighbor] = next_distance
+                queue.append(neighbor)
+
+    return distances
+
+
+def dijkstra(
+        num_nodes: int,
+        sources: Iterable[int],
+        get_neighbors: Callable[[int], Iterable[tuple[int, int]]],
+        targets: Iterable[int] = (),
+        track_predecessors: bool = False,
+) -> tuple[list[float], list[list[int]] | None]:
+    """
+    Dijkstra's algorithm with a binary heap. get_neighbors yields (neighbor, edge length)
+    pairs. If targets are given, the search stops as soon as all nodes that are at most
+    as far away as the closest target are settled. With track_predecessors, all
+    predecessors on shortest paths are recorded for each node, which allows to
+    reconstruct every shortest path, not only one of them.
+    """
+    distances = [math.inf] * num_nodes
+    predecessors = [[] for _ in range(num_nodes)] if track_predecessors else None
+    targets = set(targets)
+    heap = []
+    for source in sources:
+        distances[source] = 0
+        heap.append((0, source))
+    heapq.heapify(heap)
+
+    target_distance = math.inf
+    num_pushes = len(heap)
+    num_pops = 0
+    while heap:
+        distance, node = heapq.heappop(heap)
+        num_pops += 1
+        if distance > distances[node]:
+            # Outdated heap entry, the node has already been settled with a shorter distance
+            continue
+        if distance > target_distance:
+            break
+        if node in targets:
+            target_distance = distance
+        for neighbor, length in get_neighbors(node):
+            next_distance = distance + length
+            if next_distance < distances[neighbor]:
+                distances[neighbor] = next_distance
+                if track_predecessors:
+                    predecessors[neighbor] = [node]
+                heapq.heappush(heap, (next_distance, neighbor))
+                num_pushes += 1
+            elif track_predecessors and next_distance == distances[neighbor]:
+                predecessors[neighbor].append(node)
+
+    if metrics.ENABLED:
+        metrics.increment("dijkstra.searches")
+        metrics.increment("dijkstra.heap_pushes", num_pushes)
+        metrics.increment("dijkstra.heap_pops", num_pops)
+
+    return distances, predecessors